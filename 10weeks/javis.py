@@ -1,20 +1,144 @@
 import os
+import sqlite3                     # 녹음 파일 목록(카탈로그) 저장용
+import queue                       # 콜백 스레드 -> 기록 스레드로 오디오 블록 전달
+import threading                   # WAV 파일 기록 스레드
+import wave                        # WAV 파일을 조금씩 이어서 기록
+import time                        # 저장 처리 시간 측정
+import numpy as np                 # 오디오 배열 변환 및 음성 구간 검출
 import sounddevice as sd           # 마이크 입력 및 녹음용 라이브러리
-from scipy.io.wavfile import write # 녹음된 데이터를 wav 파일로 저장
-from datetime import datetime      # 현재 날짜와 시간을 처리하기 위한 모듈
-import glob                        # 파일 탐색용 (날짜 범위 검색 시 활용)
+from scipy.io.wavfile import write, read # 녹음된 데이터를 wav 파일로 저장 / 헤더 정보 읽기
+from datetime import datetime, timedelta # 현재 날짜와 시간을 처리하기 위한 모듈
+import glob                        # 파일 탐색용 (카탈로그 최초 생성 시 기존 파일 등록)
 
 # 녹음 파일 저장 폴더 생성
 RECORD_FOLDER = 'records'                     # 저장 폴더명
 os.makedirs(RECORD_FOLDER, exist_ok=True)     # 폴더가 없으면 새로 생성
 
+# 녹음 파일 카탈로그 (시작 시각 인덱스로 날짜 범위 조회)
+CATALOG_PATH = os.path.join(RECORD_FOLDER, 'catalog.db')
+TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S"            # 파일 이름의 날짜/시간 형식
+
+# 음성 구간 검출(VAD) 설정
+VAD_FRAME_MS = 30                             # 에너지를 계산할 프레임 길이 (ms)
+VAD_THRESHOLD_DB = -40.0                      # 이 값(dBFS)보다 작은 프레임은 무음으로 판단
+MAX_SILENCE_SEC = 0.5                         # 음성 사이에 남겨 둘 최대 무음 길이 (초)
+
+# 카탈로그 DB를 열고, 처음 만드는 경우 기존 녹음 파일을 한 번만 등록
+def _open_catalog():
+    is_new = not os.path.exists(CATALOG_PATH)
+    conn = sqlite3.connect(CATALOG_PATH)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS recordings ('
+        'filename TEXT PRIMARY KEY, '
+        'start_ts TEXT NOT NULL, '
+        'duration REAL, '
+        'sample_rate INTEGER, '
+        'size INTEGER)'
+    )
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_recordings_start ON recordings (start_ts)')
+    if is_new:
+        for filepath in glob.glob(os.path.join(RECORD_FOLDER, "*.wav")):
+            try:
+                sample_rate, data = read(filepath, mmap=True)  # 헤더만 읽고 데이터는 매핑
+                _catalog_insert(conn, filepath, len(data) / sample_rate, sample_rate)
+            except Exception:
+                continue  # 날짜 파싱/파일 읽기 실패 시 무시
+        conn.commit()
+    return conn
+
+def _catalog_insert(conn, filepath, duration, sample_rate):
+    filename = os.path.basename(filepath)
+    start = datetime.strptime(filename[:15], TIMESTAMP_FORMAT)
+    conn.execute(
+        'INSERT OR REPLACE INTO recordings (filename, start_ts, duration, sample_rate, size) '
+        'VALUES (?, ?, ?, ?, ?)',
+        (filename, start.isoformat(sep=' '), duration, sample_rate, os.path.getsize(filepath))
+    )
+
+# 새로 저장한 녹음 파일을 카탈로그에 등록하는 함수
+def catalog_add(filepath, duration, sample_rate):
+    conn = _open_catalog()
+    try:
+        with conn:
+            _catalog_insert(conn, filepath, duration, sample_rate)
+    finally:
+        conn.close()
+
+# float 오디오(-1.0 ~ 1.0)를 16비트 PCM으로 변환 (파일 크기 절반)
+def to_int16(audio):
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+# 프레임별 에너지(dBFS)를 계산하는 함수
+def frame_energy_db(audio, frame_len):
+    """
+    :param audio: (샘플 수,) 또는 (샘플 수, 채널 수) 모양의 float 배열
+    :param frame_len: 프레임 하나의 샘플 수
+    :return: 프레임별 RMS 에너지 (dBFS)
+    """
+    mono = np.asarray(audio, dtype=np.float32).reshape(len(audio), -1).mean(axis=1)
+    n_frames = len(mono) // frame_len
+    frames = mono[:n_frames * frame_len].reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    return 20 * np.log10(rms + 1e-10)
+
+# 에너지 기반 음성 구간 검출로 앞/뒤 무음과 긴 중간 무음을 제거하는 함수
+def trim_silence(audio, sample_rate, threshold_db=VAD_THRESHOLD_DB, max_silence=MAX_SILENCE_SEC):
+    """
+    음성 프레임 앞뒤로 max_silence/2 만큼만 남기고 나머지 무음 프레임을 버림
+    """
+    frame_len = max(1, int(sample_rate * VAD_FRAME_MS / 1000))
+    # 프레임 하나도 안 되는 짧은 입력은 판단할 수 없으므로 그대로 둠
+    if len(audio) < frame_len:
+        return audio
+    voiced = frame_energy_db(audio, frame_len) > threshold_db
+    if not voiced.any():
+        return audio[:0]
+
+    # 음성 프레임을 양쪽으로 pad 프레임만큼 넓혀서 남길 프레임을 정함
+    # ('same' 모드는 입력이 커널보다 짧으면 커널 길이를 돌려주므로 'full'에서 입력 길이만큼 잘라 씀)
+    pad = int(max_silence / 2 * 1000 / VAD_FRAME_MS)
+    keep = np.convolve(voiced, np.ones(2 * pad + 1), mode='full')[pad:pad + len(voiced)] > 0
+
+    # 프레임 단위 결과를 샘플 단위로 확장 (마지막 자투리 샘플은 마지막 프레임을 따름)
+    mask = np.repeat(keep, frame_len)
+    mask = np.concatenate([mask, np.full(len(audio) - len(mask), keep[-1])])
+    return audio[mask]
+
+# 녹음 데이터를 int16 + 무음 제거 후 저장하고 절감량을 보고하는 함수
+def store_recording(audio, sample_rate, filepath, trim=True):
+    """
+    :param audio: sd.rec로 받은 float32 배열
+    :return: 원본/저장 크기와 처리 시간을 담은 딕셔너리
+    """
+    start = time.perf_counter()
+    original_bytes = audio.nbytes                   # 기존 방식(float32 그대로)으로 저장했을 때의 크기
+    original_minutes = len(audio) / sample_rate / 60
+    if trim:
+        audio = trim_silence(audio, sample_rate)
+    pcm = to_int16(audio)
+    write(filepath, sample_rate, pcm)
+    elapsed = time.perf_counter() - start
+
+    stats = {
+        'original_bytes': original_bytes,
+        'stored_bytes': pcm.nbytes,
+        'duration': len(pcm) / sample_rate,
+        'seconds': elapsed,
+    }
+    saved = 1 - pcm.nbytes / original_bytes if original_bytes else 0.0
+    per_minute = elapsed / original_minutes if original_minutes else 0.0
+    print(f"저장 용량: {original_bytes / 1024:.0f}KB -> {pcm.nbytes / 1024:.0f}KB ({saved:.0%} 절감), "
+          f"처리 시간: 오디오 1분당 {per_minute * 1000:.1f}ms")
+    return stats
+
 # 음성 녹음 함수 정의
-def record_voice(duration=10, sample_rate=44100):
+def record_voice(duration=10, sample_rate=44100, compact=True):
     """
     시스템의 마이크를 통해 음성을 녹음하고
     지정된 폴더에 날짜/시간 형식으로 저장하는 함수
     :param duration: 녹음 시간 (초 단위)
     :param sample_rate: 오디오 샘플링 주기 (Hz, 기본 44.1kHz)
+    :param compact: True면 16비트 PCM 변환 + 무음 제거 후 저장
     """
     print(f"{duration}초간 녹음 시작...")
     
@@ -23,15 +147,219 @@ def record_voice(duration=10, sample_rate=44100):
     sd.wait()  # 녹음이 끝날 때까지 대기
 
     # 파일 이름 형식: '년월일-시간분초.wav'
-    filename = datetime.now().strftime("%Y%m%d-%H%M%S") + ".wav"
+    filename = datetime.now().strftime(TIMESTAMP_FORMAT) + ".wav"
     filepath = os.path.join(RECORD_FOLDER, filename)
 
     # 녹음된 데이터를 .wav 파일로 저장
-    write(filepath, sample_rate, audio_data)
+    if compact:
+        stored = store_recording(audio_data, sample_rate, filepath)['duration']
+    else:
+        write(filepath, sample_rate, audio_data)
+        stored = len(audio_data) / sample_rate
+    catalog_add(filepath, stored, sample_rate)
 
     print(f"녹음 완료! 저장 위치: {filepath}")
     return filepath  # 파일 경로 반환
 
+# 오디오 블록을 큐에서 꺼내 WAV 파일 뒤에 계속 덧붙이는 기록 스레드
+def _wav_writer(filepath, sample_rate, channels, blocks):
+    """
+    큐로 들어오는 int16 블록을 순서대로 파일에 기록하는 함수
+    None을 받으면 파일을 닫음 (닫을 때 헤더의 길이 정보가 갱신됨)
+    """
+    with wave.open(filepath, 'wb') as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)          # int16 = 2바이트
+        wf.setframerate(sample_rate)
+        while True:
+            block = blocks.get()
+            if block is None:
+                break
+            wf.writeframes(block.tobytes())
+
+# 스트리밍 방식 음성 녹음 함수 (장시간 녹음용)
+def record_voice_stream(duration=None, sample_rate=44100, channels=1, block_size=4096):
+    """
+    sd.InputStream 콜백으로 받은 블록을 기록 스레드가 바로 파일에 이어 쓰는 함수
+    전체 녹음을 메모리에 올리지 않으므로 녹음 시간과 관계없이 메모리 사용량이 일정함
+    :param duration: 녹음 시간 (초 단위, None이면 Enter 키를 누를 때까지)
+    :param sample_rate: 오디오 샘플링 주기 (Hz, 기본 44.1kHz)
+    :param channels: 채널 수 (기본 모노)
+    :param block_size: 콜백 한 번에 받는 프레임 수
+    """
+    filename = datetime.now().strftime(TIMESTAMP_FORMAT) + ".wav"
+    filepath = os.path.join(RECORD_FOLDER, filename)
+
+    blocks = queue.Queue()
+    writer = threading.Thread(
+        target=_wav_writer, args=(filepath, sample_rate, channels, blocks), daemon=True
+    )
+    writer.start()
+
+    # 콜백은 오디오 스레드에서 호출되므로 복사본만 큐에 넣고 바로 반환
+    def callback(indata, frames, time_info, status):
+        if status:
+            print(f"[경고] {status}")
+        blocks.put(indata.copy())
+
+    try:
+        with sd.InputStream(samplerate=sample_rate, channels=channels, dtype='int16',
+                            blocksize=block_size, callback=callback):
+            if duration is None:
+                input("녹음 중... 종료하려면 Enter 키를 누르세요.")
+            else:
+                print(f"{duration}초간 녹음 시작...")
+                sd.sleep(int(duration * 1000))
+    finally:
+        # 남은 블록을 모두 기록한 뒤 파일을 닫음
+        blocks.put(None)
+        writer.join()
+
+    with wave.open(filepath, 'rb') as wf:
+        catalog_add(filepath, wf.getnframes() / sample_rate, sample_rate)
+
+    print(f"녹음 완료! 저장 위치: {filepath}")
+    return filepath
+
+# 음성이 감지될 때만 구간 파일을 만드는 상시 녹음기
+class VoiceSegmenter:
+    """
+    최근 preroll초의 오디오를 링 버퍼에 유지하다가 음성이 감지되면
+    링 버퍼 내용(프리롤)부터 새 구간 파일에 기록하고,
+    trailing_silence초 동안 무음이 이어지면 파일을 닫음
+    """
+
+    def __init__(self, sample_rate=16000, channels=1, preroll=2.0, trailing_silence=1.5,
+                 threshold_db=VAD_THRESHOLD_DB):
+        if preroll < 0:
+            raise ValueError(f"preroll은 0 이상이어야 합니다: {preroll}")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.trailing_silence = trailing_silence
+        self.threshold_db = threshold_db
+
+        # 프리롤 링 버퍼: 고정 크기 배열에 위치만 돌려가며 덮어씀 (추가 할당 없음)
+        self.ring = np.zeros((int(preroll * sample_rate), channels), dtype=np.float32)
+        self.ring_pos = 0
+        self.ring_filled = False
+
+        self.segment = None          # 현재 기록 중인 wave 파일
+        self.segment_path = None
+        self.segment_frames = 0
+        self.silence = 0.0           # 구간 기록 중 이어진 무음 길이 (초)
+
+    def _push_ring(self, block):
+        """블록을 링 버퍼에 덮어씀 (블록이 버퍼보다 크면 뒷부분만 유지)"""
+        size = len(self.ring)
+        if size == 0:  # preroll=0: 프리롤 없이 음성이 감지된 블록부터 기록
+            return
+        block = block[-size:]
+        end = self.ring_pos + len(block)
+        if end <= size:
+            self.ring[self.ring_pos:end] = block
+        else:
+            split = size - self.ring_pos
+            self.ring[self.ring_pos:] = block[:split]
+            self.ring[:end - size] = block[split:]
+            self.ring_filled = True
+        self.ring_pos = end % size
+        if end == size:
+            self.ring_filled = True
+
+    def _preroll(self):
+        """링 버퍼 내용을 시간 순서대로 반환"""
+        if not self.ring_filled:
+            return self.ring[:self.ring_pos]
+        return np.concatenate((self.ring[self.ring_pos:], self.ring[:self.ring_pos]))
+
+    def _open_segment(self):
+        preroll = self._preroll()
+        started = datetime.now() - timedelta(seconds=len(preroll) / self.sample_rate)
+        filepath = os.path.join(RECORD_FOLDER, started.strftime(TIMESTAMP_FORMAT) + ".wav")
+        index = 1
+        while os.path.exists(filepath):  # 같은 초에 구간이 두 개 생기면 번호를 붙임
+            filepath = os.path.join(RECORD_FOLDER, f"{started.strftime(TIMESTAMP_FORMAT)}-{index}.wav")
+            index += 1
+
+        self.segment = wave.open(filepath, 'wb')
+        self.segment.setnchannels(self.channels)
+        self.segment.setsampwidth(2)
+        self.segment.setframerate(self.sample_rate)
+        self.segment_path = filepath
+        self.segment_frames = 0
+        self.silence = 0.0
+        self._write(preroll)
+        print(f"[음성 감지] 구간 기록 시작: {filepath}")
+
+    def _write(self, block):
+        self.segment.writeframes(to_int16(block).tobytes())
+        self.segment_frames += len(block)
+
+    def close(self):
+        """기록 중인 구간을 닫고 카탈로그에 등록"""
+        if self.segment is None:
+            return None
+        self.segment.close()
+        catalog_add(self.segment_path, self.segment_frames / self.sample_rate, self.sample_rate)
+        print(f"[구간 종료] {self.segment_path} ({self.segment_frames / self.sample_rate:.1f}초)")
+        filepath, self.segment, self.segment_path = self.segment_path, None, None
+        self.ring_pos, self.ring_filled = 0, False   # 이미 기록한 프리롤은 비움
+        return filepath
+
+    def feed(self, block):
+        """
+        오디오 블록 하나를 처리 (블록당 RMS 한 번만 계산하므로 CPU 사용량이 낮음)
+        :param block: (프레임 수, 채널 수) 모양의 float32 배열
+        """
+        voiced = frame_energy_db(block, len(block))[0] > self.threshold_db if len(block) else False
+
+        if self.segment is None:
+            if voiced:
+                self._open_segment()
+                self._write(block)
+            else:
+                self._push_ring(block)
+            return
+
+        self._write(block)
+        self.silence = 0.0 if voiced else self.silence + len(block) / self.sample_rate
+        if self.silence >= self.trailing_silence:
+            self.close()
+
+# 상시 녹음 모드: 음성이 있는 구간만 저장
+def record_continuous(sample_rate=16000, channels=1, block_ms=100, **segmenter_options):
+    """
+    마이크를 계속 열어 두고 음성 구간만 타임스탬프 파일로 저장하는 함수
+    Enter 키를 누르면 종료
+    :param block_ms: 콜백 블록 길이 (ms, 클수록 CPU 사용량이 줄어듦)
+    """
+    segmenter = VoiceSegmenter(sample_rate, channels, **segmenter_options)
+    blocks = queue.Queue()
+
+    # 블록 처리와 파일 기록은 별도 스레드에서 수행 (오디오 콜백은 큐에 넣기만 함)
+    def worker():
+        while True:
+            block = blocks.get()
+            if block is None:
+                break
+            segmenter.feed(block)
+        segmenter.close()
+
+    def callback(indata, frames, time_info, status):
+        if status:
+            print(f"[경고] {status}")
+        blocks.put(indata.copy())
+
+    processor = threading.Thread(target=worker, daemon=True)
+    processor.start()
+    try:
+        with sd.InputStream(samplerate=sample_rate, channels=channels, dtype='float32',
+                            blocksize=int(sample_rate * block_ms / 1000), callback=callback):
+            input("상시 녹음 중... 음성 구간만 저장됩니다. 종료하려면 Enter 키를 누르세요.")
+    finally:
+        blocks.put(None)
+        processor.join()
+
 # 날짜 범위에 따른 파일 조회 기능 (보너스 과제)
 def list_records_by_date(start_date, end_date):
     """
@@ -41,29 +369,29 @@ def list_records_by_date(start_date, end_date):
     """
     print(f"녹음 파일 검색: {start_date} ~ {end_date}")
     
-    # 입력된 문자열을 datetime 객체로 변환
+    # 입력된 문자열을 datetime 객체로 변환 (종료 날짜는 그날 전체 포함)
     start_dt = datetime.strptime(start_date, "%Y%m%d")
-    end_dt = datetime.strptime(end_date, "%Y%m%d")
-
-    matched_files = []  # 조건에 맞는 파일들을 저장할 리스트
+    end_dt = datetime.strptime(end_date, "%Y%m%d") + timedelta(days=1)
 
-    # 모든 녹음 파일들을 순회하며 날짜 필터링
-    for filepath in glob.glob(os.path.join(RECORD_FOLDER, "*.wav")):
-        filename = os.path.basename(filepath)
-        try:
-            file_dt = datetime.strptime(filename[:8], "%Y%m%d")
-            if start_dt <= file_dt <= end_dt:
-                matched_files.append(filename)
-        except:
-            continue  # 날짜 파싱 실패 시 무시
+    # 시작 시각 인덱스를 이용한 범위 조회
+    conn = _open_catalog()
+    try:
+        matched = conn.execute(
+            'SELECT filename, duration FROM recordings '
+            'WHERE start_ts >= ? AND start_ts < ? ORDER BY start_ts',
+            (start_dt.isoformat(sep=' '), end_dt.isoformat(sep=' '))
+        ).fetchall()
+    finally:
+        conn.close()
 
     # 결과 출력
-    if matched_files:
+    if matched:
         print(" 해당 기간의 녹음 파일 목록:")
-        for f in sorted(matched_files):
-            print(f" - {f}")
+        for filename, duration in matched:
+            print(f" - {filename} ({duration:.1f}초)")
     else:
         print("해당 기간에 해당하는 녹음 파일이 없습니다.")
+    return [filename for filename, _ in matched]
 
 # 실행 루틴: 메뉴 기반 동작
 if __name__ == "__main__":
@@ -71,6 +399,8 @@ if __name__ == "__main__":
         print("\n=== Javis 음성 기록 시스템 ===")
         print("1. 새 음성 녹음")
         print("2. 날짜 범위로 녹음 파일 조회")
+        print("3. 장시간 음성 녹음 (Enter로 종료)")
+        print("4. 상시 녹음 (음성 구간만 저장)")
         print("0. 종료")
         choice = input("선택 >> ")
 
@@ -84,6 +414,10 @@ if __name__ == "__main__":
             s = input("시작 날짜 (예: 20250501): ")
             e = input("종료 날짜 (예: 20250531): ")
             list_records_by_date(s, e)
+        elif choice == "3":
+            record_voice_stream()
+        elif choice == "4":
+            record_continuous()
         elif choice == "0":
             break
         else:
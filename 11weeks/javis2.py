@@ -1,9 +1,42 @@
 import os
 import csv
+import json
+import shutil
+import hashlib
+import sqlite3
+import random
 import subprocess
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from math import gcd
+import numpy as np
+from scipy.io import wavfile
+from scipy.signal import resample_poly
 import speech_recognition as sr
 
-# ✅ WAV 파일을 PCM 형식으로 변환하는 함수
+# 음성 인식에 사용할 오디오 형식 (16kHz, 모노, 16비트)
+TARGET_RATE = 16000
+SAMPLE_WIDTH = 2
+
+# 변환 상태 기록 파일과 동시 인식 작업 수 (인식은 네트워크 대기가 대부분이라 스레드 사용)
+MANIFEST_PATH = os.path.join('records', 'manifest.json')
+MAX_WORKERS = 4
+
+# 무음 기준 구간 분할 설정
+SEGMENT_MAX_SEC = 30          # 한 번에 인식기로 보낼 최대 구간 길이 (초)
+MIN_SILENCE_SEC = 0.3         # 구간 경계로 쓸 최소 무음 길이 (초)
+SILENCE_DB = -40.0            # 이 값(dBFS)보다 작은 프레임은 무음
+FRAME_MS = 30                 # 에너지를 계산할 프레임 길이 (ms)
+
+# 자막 검색 인덱스 (글자 1-gram/2-gram 역색인)
+INDEX_PATH = os.path.join('records', 'transcripts.db')
+
+# 구간 인식 요청을 처리하는 공용 스레드 풀 (여러 파일을 동시에 처리해도 전체 요청 수를 제한)
+# 여러 스레드가 동시에 처음 호출해도 풀이 하나만 생기도록 모듈 로드 시 생성 (스레드는 필요할 때 생김)
+_recognize_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+# ✅ WAV 파일을 PCM 형식의 파일로 변환하는 함수 (ffmpeg 사용)
 def convert_to_pcm_wav(input_path, output_path):
     command = [
         'ffmpeg', '-y', '-i', input_path,
@@ -11,69 +44,387 @@ def convert_to_pcm_wav(input_path, output_path):
     ]
     subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-# 🎙️ PCM WAV 오디오 파일을 텍스트로 변환하는 함수
-def convert_audio_to_text(file_path):
-    recognizer = sr.Recognizer()
-    with sr.AudioFile(file_path) as source:
-        audio_data = recognizer.record(source)
-        try:
-            return recognizer.recognize_google(audio_data, language='ko-KR')
-        except sr.UnknownValueError:
-            return '인식 실패'
-        except sr.RequestError:
-            return 'API 오류'
+# 🎚️ WAV 파일을 프로세스 안에서 16kHz 모노 int16 샘플로 변환하는 함수
+def load_pcm16k(input_path):
+    rate, data = wavfile.read(input_path)
+    return to_pcm16k(rate, data)
+
+# 🎛️ 읽어 들인 샘플을 16kHz 모노 int16으로 변환하는 함수 (디코딩과 분리해 단계별 측정 가능)
+def to_pcm16k(rate, data):
+    # 정수/실수 형식을 -1.0 ~ 1.0 범위의 float로 정규화
+    if data.dtype == np.uint8:
+        samples = (data.astype(np.float32) - 128) / 128
+    elif np.issubdtype(data.dtype, np.integer):
+        samples = data.astype(np.float32) / np.iinfo(data.dtype).max
+    else:
+        samples = data.astype(np.float32)
+
+    # 다채널이면 평균으로 모노 변환
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+
+    # 폴리페이즈 필터로 리샘플링 (예: 44100 -> 16000 은 160/441)
+    if rate != TARGET_RATE:
+        g = gcd(rate, TARGET_RATE)
+        samples = resample_poly(samples, TARGET_RATE // g, rate // g)
+
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+
+# 🧩 ffmpeg 대체 경로: 파일을 만들지 않고 표준 출력으로 PCM을 받음
+def load_pcm16k_ffmpeg(input_path):
+    command = [
+        'ffmpeg', '-v', 'error', '-i', input_path,
+        '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', str(TARGET_RATE), '-'
+    ]
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+    return np.frombuffer(result.stdout, dtype=np.int16)
+
+# 📥 오디오 파일을 16kHz int16 샘플로 읽는 함수
+def load_pcm(input_path):
+    try:
+        return load_pcm16k(input_path)
+    except (ValueError, OSError):
+        # scipy가 해석하지 못하는 형식만 ffmpeg로 처리
+        return load_pcm16k_ffmpeg(input_path)
+
+# 📦 오디오 파일을 인식기에 바로 넣을 수 있는 AudioData로 읽는 함수
+def load_audio_data(input_path):
+    return sr.AudioData(load_pcm(input_path).tobytes(), TARGET_RATE, SAMPLE_WIDTH)
+
+# ✂️ 무음 구간을 경계로 오디오를 최대 SEGMENT_MAX_SEC 길이의 구간들로 나누는 함수
+def split_on_silence(pcm, rate=TARGET_RATE, max_sec=SEGMENT_MAX_SEC,
+                     min_silence_sec=MIN_SILENCE_SEC, silence_db=SILENCE_DB):
+    """
+    :return: (시작 샘플, 끝 샘플) 목록, 전부 무음인 구간은 제외
+    """
+    frame_len = int(rate * FRAME_MS / 1000)
+    n_frames = len(pcm) // frame_len
+    if n_frames == 0:
+        return [(0, len(pcm))] if len(pcm) else []
+
+    # 프레임별 에너지 (dBFS)
+    frames = pcm[:n_frames * frame_len].astype(np.float32).reshape(n_frames, frame_len) / 32768
+    energy_db = 20 * np.log10(np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-10)
+    silent = energy_db < silence_db
+
+    # 충분히 긴 무음 구간의 가운데를 경계 후보로 사용
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], silent.astype(np.int8), [0]))))
+    min_frames = max(1, int(min_silence_sec * 1000 / FRAME_MS))
+    cuts = [
+        int((start + end) // 2) * frame_len
+        for start, end in zip(edges[::2], edges[1::2]) if end - start >= min_frames
+    ]
+
+    # 최대 길이를 넘지 않는 범위에서 가장 늦은 경계에서 자름 (경계가 없으면 강제로 자름)
+    max_len = int(max_sec * rate)
+    boundaries, start = [], 0
+    while len(pcm) - start > max_len:
+        candidates = [c for c in cuts if start < c <= start + max_len]
+        end = candidates[-1] if candidates else start + max_len
+        boundaries.append((start, end))
+        start = end
+    boundaries.append((start, len(pcm)))
+
+    # 구간 안에 음성 프레임이 하나도 없으면 인식 요청을 보내지 않음
+    segments = []
+    for start, end in boundaries:
+        first, last = start // frame_len, max(start // frame_len + 1, end // frame_len)
+        if not silent[first:last].all():
+            segments.append((start, end))
+    return segments
+
+# ⏱️ 초를 mm:ss 형식으로 바꾸는 함수
+def format_offset(seconds):
+    seconds = int(seconds)
+    return f'{seconds // 60:02d}:{seconds % 60:02d}'
+
+# ⏱️ mm:ss 문자열을 초로 바꾸는 함수 (분이 두 자리를 넘어도 처리)
+def parse_offset(text):
+    minutes, _, seconds = str(text).rpartition(':')
+    return int(minutes or 0) * 60 + int(seconds)
+
+# 🧵 구간들을 동시에 인식하고 (시작 시각, 텍스트)를 순서대로 반환하는 함수
+def transcribe_segments(pcm, rate=TARGET_RATE):
+    segments = split_on_silence(pcm, rate)
+    audio_segments = [
+        sr.AudioData(pcm[start:end].tobytes(), rate, SAMPLE_WIDTH) for start, end in segments
+    ]
+    # map은 제출 순서대로 결과를 돌려주므로 행 순서가 유지됨
+    texts = _recognize_pool.map(convert_audio_to_text, audio_segments)
+    return [(format_offset(start / rate), text) for (start, _), text in zip(segments, texts)]
+
+# 🌐 Google 음성 인식 백엔드 (기본값)
+class GoogleRecognizer:
+    def __init__(self, language='ko-KR'):
+        self.language = language
+
+    def recognize(self, audio_data):
+        return sr.Recognizer().recognize_google(audio_data, language=self.language)
+
+# 🧪 네트워크 없이 파이프라인을 실행/측정하기 위한 결정적 로컬 백엔드
+class StubRecognizer:
+    """
+    같은 오디오에는 항상 같은 결과를 돌려줌
+    :param latency: 요청 한 번당 대기 시간 (초, 네트워크 지연 흉내)
+    :param failure_rate: API 오류(sr.RequestError)를 낼 확률
+    :param unknown_rate: 인식 실패(sr.UnknownValueError)를 낼 확률
+    """
+
+    def __init__(self, latency=0.0, failure_rate=0.0, unknown_rate=0.0, seed=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.unknown_rate = unknown_rate
+        self.seed = seed
+
+    def recognize(self, audio_data):
+        raw = audio_data.get_raw_data()
+        rng = random.Random(zlib.crc32(raw) ^ self.seed)
+        if self.latency:
+            time.sleep(self.latency)
+        roll = rng.random()
+        if roll < self.failure_rate:
+            raise sr.RequestError('stub failure')
+        if roll < self.failure_rate + self.unknown_rate:
+            raise sr.UnknownValueError()
+        seconds = len(raw) / (audio_data.sample_rate * audio_data.sample_width)
+        return f'테스트 음성 {rng.randrange(1000):03d} ({seconds:.1f}초)'
+
+# 현재 사용 중인 인식 백엔드
+recognizer_backend = GoogleRecognizer()
+
+def set_recognizer(backend):
+    global recognizer_backend
+    recognizer_backend = backend
+
+# 🎙️ 오디오를 텍스트로 변환하는 함수 (파일 경로 또는 AudioData)
+def convert_audio_to_text(audio):
+    audio_data = audio if isinstance(audio, sr.AudioData) else load_audio_data(audio)
+    try:
+        return recognizer_backend.recognize(audio_data)
+    except sr.UnknownValueError:
+        return '인식 실패'
+    except sr.RequestError:
+        return 'API 오류'
 
 # 💾 변환된 텍스트를 CSV 파일로 저장하는 함수
 def save_text_to_csv(wav_file):
     base_name = os.path.splitext(wav_file)[0]
     wav_path = os.path.join('records', wav_file)
-    converted_path = os.path.join('records', f'{base_name}_converted.wav')
     csv_path = os.path.join('records', f'{base_name}.csv')
 
-    # PCM 변환
-    convert_to_pcm_wav(wav_path, converted_path)
-
-    # 변환된 PCM WAV로 텍스트 추출
-    text = convert_audio_to_text(converted_path)
+    # 16kHz PCM으로 메모리에서 변환한 뒤 무음 기준 구간별로 텍스트 추출 (임시 파일 없음)
+    rows = transcribe_segments(load_pcm(wav_path))
 
     with open(csv_path, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(['시간', '텍스트'])
-        writer.writerow(['00:00', text])
+        writer.writerows(rows)
 
+    index_transcript(csv_path, rows)
     print(f'{csv_path} 저장 완료.')
+    return csv_path, rows
+
+# 🔑 오디오 파일 내용의 해시를 구하는 함수
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+# 📒 파일별 처리 상태(manifest)를 읽고 쓰는 함수
+def load_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    with open(MANIFEST_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_manifest(manifest):
+    # 중간에 종료되어도 manifest가 깨지지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = MANIFEST_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
 
-# 🧹 records 폴더 내 모든 WAV 처리
-def process_all_wav_files():
+# 🧹 records 폴더 내 모든 WAV 처리 (이미 변환한 내용은 건너뜀)
+def process_all_wav_files(workers=MAX_WORKERS):
     folder = 'records'
     if not os.path.exists(folder):
         print('records 폴더가 없습니다.')
         return
 
-    for filename in os.listdir(folder):
-        if filename.endswith('.wav') and not filename.endswith('_converted.wav'):
-            print(f'{filename} 처리 중...')
-            save_text_to_csv(filename)
+    manifest = load_manifest()
+    # 해시 -> 완료된 CSV 경로 (같은 내용의 파일은 다시 인식하지 않음)
+    transcripts = {
+        entry['hash']: entry['csv'] for entry in manifest.values()
+        if entry.get('status') == 'done' and os.path.exists(entry.get('csv', ''))
+    }
+
+    todo = []
+    for filename in sorted(os.listdir(folder)):
+        if not filename.endswith('.wav') or filename.endswith('_converted.wav'):
+            continue
+        path = os.path.join(folder, filename)
+        stat = os.stat(path)
+        known = filename in manifest
+        entry = manifest.get(filename, {})
+
+        # 크기와 수정 시각이 그대로면 해시를 다시 계산하지 않음
+        if entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime:
+            digest = entry['hash']
+        else:
+            digest = file_hash(path)
+        entry.update({'hash': digest, 'size': stat.st_size, 'mtime': stat.st_mtime})
+        manifest[filename] = entry
+
+        csv_path = os.path.join(folder, f'{os.path.splitext(filename)[0]}.csv')
+        if not known and os.path.exists(csv_path):
+            # manifest가 생기기 전에 만든 CSV는 완료로 기록 (다시 인식하거나 덮어쓰지 않음)
+            entry.update({'status': 'done', 'csv': csv_path})
+            transcripts.setdefault(digest, csv_path)
+            continue
+
+        if digest in transcripts:
+            # 내용이 같은 파일의 결과가 이미 있으면 복사만 함
+            if transcripts[digest] != csv_path:
+                shutil.copyfile(transcripts[digest], csv_path)
+                index_transcript(csv_path)
+            entry.update({'status': 'done', 'csv': csv_path})
+            continue
+
+        entry['status'] = 'pending'
+        todo.append(filename)
+
+    save_manifest(manifest)
+    if not todo:
+        print('새로 변환할 파일이 없습니다.')
+        return
+
+    print(f'{len(todo)}개 파일 처리 중... (동시 작업 {workers}개)')
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(save_text_to_csv, filename): filename for filename in todo}
+        # 결과 반영은 이 스레드에서만 하므로 manifest에 별도 잠금이 필요 없음
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                csv_path, rows = future.result()
+                # API 오류는 다음 실행에서 다시 시도하도록 실패로 기록
+                status = 'failed' if any(text == 'API 오류' for _, text in rows) else 'done'
+                update = {'status': status, 'csv': csv_path}
+            except Exception as e:
+                print(f'{filename} 처리 실패: {e}')
+                update = {'status': 'failed', 'error': str(e)}
+            manifest[filename].update(update)
+            save_manifest(manifest)
+
+# 🗂️ 검색 인덱스 DB를 여는 함수
+def _open_index():
+    # 여러 스레드가 동시에 CSV를 저장할 수 있으므로 잠금 대기 시간을 넉넉히 둠
+    conn = sqlite3.connect(INDEX_PATH, timeout=30)
+    # 시각을 문자열로 저장하던 예전 인덱스는 지우고 다시 만듦 (sync_index가 CSV에서 재구축)
+    columns = {row[1]: row[2] for row in conn.execute('PRAGMA table_info(segments)')}
+    if columns and columns.get('offset') != 'INTEGER':
+        conn.executescript(
+            'DROP TABLE IF EXISTS grams;'
+            'DROP TABLE IF EXISTS segments;'
+            'DROP TABLE IF EXISTS files;'
+        )
+    conn.executescript(
+        'CREATE TABLE IF NOT EXISTS files ('
+        '  file TEXT PRIMARY KEY, mtime REAL);'
+        'CREATE TABLE IF NOT EXISTS segments ('
+        '  id INTEGER PRIMARY KEY, file TEXT NOT NULL, offset INTEGER, text TEXT);'
+        'CREATE INDEX IF NOT EXISTS idx_segments_file ON segments (file);'
+        'CREATE TABLE IF NOT EXISTS grams ('
+        '  gram TEXT NOT NULL, segment_id INTEGER NOT NULL,'
+        '  PRIMARY KEY (gram, segment_id)) WITHOUT ROWID;'
+    )
+    return conn
+
+# 🔤 텍스트의 글자 n-gram 집합 (한국어는 띄어쓰기와 관계없이 찾을 수 있도록 글자 단위 사용)
+def char_ngrams(text, n):
+    text = ''.join(text.split())
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+# 📝 CSV 하나의 내용을 인덱스에 반영하는 함수 (같은 파일의 예전 내용은 교체)
+def index_transcript(csv_path, rows=None):
+    filename = os.path.basename(csv_path)
+    if rows is None:
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            rows = [row for row in reader if len(row) >= 2]
+
+    conn = _open_index()
+    try:
+        with conn:
+            conn.execute(
+                'DELETE FROM grams WHERE segment_id IN (SELECT id FROM segments WHERE file = ?)',
+                (filename,)
+            )
+            conn.execute('DELETE FROM segments WHERE file = ?', (filename,))
+            for offset, text in rows:
+                cursor = conn.execute(
+                    'INSERT INTO segments (file, offset, text) VALUES (?, ?, ?)',
+                    (filename, parse_offset(offset), text)
+                )
+                grams = char_ngrams(text, 1) | char_ngrams(text, 2)
+                conn.executemany(
+                    'INSERT OR IGNORE INTO grams (gram, segment_id) VALUES (?, ?)',
+                    [(gram, cursor.lastrowid) for gram in grams]
+                )
+            conn.execute(
+                'INSERT OR REPLACE INTO files (file, mtime) VALUES (?, ?)',
+                (filename, os.path.getmtime(csv_path))
+            )
+    finally:
+        conn.close()
+
+# 🔄 인덱스에 없거나 바뀐 CSV만 반영하는 함수 (기존 자막 최초 등록용)
+def sync_index(folder='records'):
+    conn = _open_index()
+    try:
+        indexed = dict(conn.execute('SELECT file, mtime FROM files'))
+    finally:
+        conn.close()
 
-# 🔍 키워드 검색 기능
-def search_keyword_in_csv(keyword):
-    folder = 'records'
-    found = False
     for filename in os.listdir(folder):
         if filename.endswith('.csv'):
             path = os.path.join(folder, filename)
-            with open(path, newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader)
-                for row in reader:
-                    if keyword in row[1]:
-                        print(f'[검색 결과] {filename} - {row[0]}: {row[1]}')
-                        found = True
-    if not found:
+            if indexed.get(filename) != os.path.getmtime(path):
+                index_transcript(path)
+
+# 🔍 인덱스로 키워드가 포함된 (파일, 시각, 텍스트)를 찾는 함수
+def search_keyword(keyword):
+    # 키워드의 2-gram(한 글자면 1-gram)을 모두 가진 구간만 추린 뒤 실제 포함 여부를 확인
+    compact = ''.join(keyword.split())
+    grams = sorted(char_ngrams(compact, 2) or char_ngrams(compact, 1))
+    if not grams:
+        return []
+    candidates = ' INTERSECT '.join(['SELECT segment_id FROM grams WHERE gram = ?'] * len(grams))
+    conn = _open_index()
+    try:
+        # 정렬은 초 단위 정수로 하고, 출력용으로만 mm:ss 형식으로 바꿈
+        rows = conn.execute(
+            f'SELECT file, offset, text FROM segments '
+            f'WHERE id IN ({candidates}) AND instr(text, ?) > 0 ORDER BY file, offset',
+            (*grams, keyword)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [(filename, format_offset(offset), text) for filename, offset, text in rows]
+
+# 🔍 키워드 검색 기능
+def search_keyword_in_csv(keyword):
+    results = search_keyword(keyword)
+    for filename, offset, text in results:
+        print(f'[검색 결과] {filename} - {offset}: {text}')
+    if not results:
         print('키워드가 포함된 결과를 찾지 못했습니다.')
 
 # ▶️ 메인 실행
 if __name__ == '__main__':
     process_all_wav_files()
+    sync_index()
     keyword = input('검색할 키워드를 입력하세요: ')
     search_keyword_in_csv(keyword)
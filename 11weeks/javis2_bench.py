@@ -0,0 +1,97 @@
+import os
+import csv
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+from scipy.io import wavfile
+
+import javis2
+
+# 🎼 음성 구간(톤)과 무음이 번갈아 나오는 합성 녹음 파일을 만드는 함수
+def make_synthetic_wav(path, seconds, rate=44100, channels=2, seed=0):
+    rng = np.random.default_rng(seed)
+    audio = np.zeros((int(seconds * rate), channels), dtype=np.float32)
+    pos = 0
+    while pos < len(audio):
+        speech = int(rng.uniform(1.0, 6.0) * rate)
+        pause = int(rng.uniform(0.4, 1.5) * rate)
+        t = np.arange(min(speech, len(audio) - pos)) / rate
+        tone = 0.3 * np.sin(2 * np.pi * rng.uniform(120, 300) * t)
+        audio[pos:pos + len(t)] = tone[:, None]
+        pos += speech + pause
+    wavfile.write(path, rate, (audio * 32767).astype(np.int16))
+
+# ⏱️ 파일별 단계 시간 측정: 디코딩 -> 리샘플링 -> 인식 -> 저장
+def measure_stages(paths):
+    totals = {'decode': 0.0, 'resample': 0.0, 'recognize': 0.0, 'write': 0.0}
+    for path in paths:
+        t0 = time.perf_counter()
+        rate, data = wavfile.read(path)
+        t1 = time.perf_counter()
+        pcm = javis2.to_pcm16k(rate, data)
+        t2 = time.perf_counter()
+        rows = javis2.transcribe_segments(pcm)
+        t3 = time.perf_counter()
+        csv_path = os.path.splitext(path)[0] + '.csv'
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['시간', '텍스트'])
+            writer.writerows(rows)
+        javis2.index_transcript(csv_path, rows)
+        t4 = time.perf_counter()
+
+        totals['decode'] += t1 - t0
+        totals['resample'] += t2 - t1
+        totals['recognize'] += t3 - t2
+        totals['write'] += t4 - t3
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description='javis2 전사 파이프라인 벤치마크 (오프라인)')
+    parser.add_argument('--files', type=int, default=20)
+    parser.add_argument('--seconds', type=float, default=60.0, help='파일 하나의 길이 (초)')
+    parser.add_argument('--latency', type=float, default=0.2, help='인식 요청 한 번당 지연 (초)')
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, default=javis2.MAX_WORKERS)
+    args = parser.parse_args()
+
+    javis2.set_recognizer(javis2.StubRecognizer(latency=args.latency, failure_rate=args.failure_rate))
+    cwd = os.getcwd()
+    tmp = tempfile.mkdtemp()
+    try:
+        # javis2는 현재 폴더의 records/를 사용하므로 임시 폴더에서 실행
+        os.chdir(tmp)
+        os.makedirs('records')
+        for i in range(args.files):
+            make_synthetic_wav(os.path.join('records', f'bench-{i:04d}.wav'), args.seconds, seed=i)
+        paths = [os.path.join('records', name) for name in sorted(os.listdir('records'))]
+        audio_minutes = args.files * args.seconds / 60
+
+        print(f'[*] 단계별 시간 (순차 처리, 파일 {args.files}개, 오디오 {audio_minutes:.1f}분)')
+        totals = measure_stages(paths)
+        for stage, seconds in totals.items():
+            print(f'  {stage:<10} {seconds:8.3f}초  (파일당 {seconds / args.files * 1000:8.1f}ms)')
+
+        # 전체 파이프라인 측정을 위해 단계 측정에서 만든 결과는 지움
+        for name in os.listdir('records'):
+            if not name.endswith('.wav'):
+                os.remove(os.path.join('records', name))
+
+        print(f'[*] 전체 파이프라인 (동시 작업 {args.workers}개)')
+        t0 = time.perf_counter()
+        javis2.process_all_wav_files(workers=args.workers)
+        elapsed = time.perf_counter() - t0
+        print(f'  처리량: {args.files / elapsed * 60:.1f} 파일/분 '
+              f'(오디오 {audio_minutes / elapsed * 60:.1f}분/분, {elapsed:.2f}초)')
+
+        t0 = time.perf_counter()
+        javis2.process_all_wav_files(workers=args.workers)
+        print(f'  재실행 (변경 없음): {time.perf_counter() - t0:.3f}초')
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
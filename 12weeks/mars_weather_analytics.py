@@ -0,0 +1,137 @@
+import os
+import csv
+import argparse
+import numpy as np
+
+# 분석용 스냅샷 파일 (원본 CSV 옆에 저장)
+SNAPSHOT_SUFFIX = '.npz'
+
+# 날짜/기온/폭풍 값을 NumPy 배열로 들고 있는 화성 기상 시계열
+class WeatherSeries:
+    def __init__(self, dates, temp, storm):
+        # 날짜순으로 정렬해 두면 기간 검색을 이진 탐색으로 할 수 있음
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        order = np.argsort(dates, kind='stable')
+        self.dates = dates[order]
+        self.temp = np.asarray(temp, dtype=np.float64)[order]
+        self.storm = np.asarray(storm, dtype=np.int64)[order]
+
+    def __len__(self):
+        return len(self.dates)
+
+    # 날짜 범위 [start, end]에 해당하는 부분 시계열
+    def between(self, start=None, end=None):
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(start, 'D'), 'left')
+        hi = len(self) if end is None else np.searchsorted(self.dates, np.datetime64(end, 'D'), 'right')
+        return WeatherSeries(self.dates[lo:hi], self.temp[lo:hi], self.storm[lo:hi])
+
+    # 기간 단위로 묶어 집계 (freq: 'D', 'W', 'M', 'Y', agg: 'mean', 'min', 'max', 'sum', 'count')
+    def resample(self, freq='M', column='temp', agg='mean'):
+        values = getattr(self, column).astype(np.float64)
+        periods, starts, counts = np.unique(self.dates.astype(f'datetime64[{freq}]'),
+                                            return_index=True, return_counts=True)
+        if agg == 'count':
+            result = counts.astype(np.float64)
+        elif agg in ('sum', 'mean'):
+            result = np.add.reduceat(values, starts)
+            if agg == 'mean':
+                result /= counts
+        elif agg == 'min':
+            result = np.minimum.reduceat(values, starts)
+        elif agg == 'max':
+            result = np.maximum.reduceat(values, starts)
+        else:
+            raise ValueError(f'지원하지 않는 집계 방식: {agg}')
+        return periods, result
+
+    # window개 값의 이동 평균 (앞쪽 window-1개는 NaN)
+    def rolling_mean(self, window, column='temp'):
+        values = getattr(self, column).astype(np.float64)
+        result = np.full(len(values), np.nan)
+        if 0 < window <= len(values):
+            cumsum = np.cumsum(np.concatenate(([0.0], values)))
+            result[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+        return result
+
+    # 백분위수 (q는 0~100, 여러 개 가능)
+    def percentile(self, q, column='temp'):
+        return np.percentile(getattr(self, column), q)
+
+    # 폭풍 값이 threshold 이상인 날짜들
+    def storm_days(self, threshold):
+        return self.dates[self.storm >= threshold]
+
+    # 기간별로 폭풍 값이 threshold 이상인 날의 비율
+    def storm_ratio(self, threshold, freq='M'):
+        periods, starts, counts = np.unique(self.dates.astype(f'datetime64[{freq}]'),
+                                            return_index=True, return_counts=True)
+        hits = np.add.reduceat((self.storm >= threshold).astype(np.int64), starts)
+        return periods, hits / counts
+
+    # 스냅샷 저장
+    def save(self, path, source_stamp=()):
+        np.savez(path, dates=self.dates, temp=self.temp, storm=self.storm,
+                 source_stamp=np.asarray(source_stamp, dtype=np.float64))
+
+# CSV 파일에서 읽기 (stom/storm 오타 모두 허용)
+def load_csv(csv_file):
+    with open(csv_file, newline='') as file:
+        reader = csv.DictReader(file)
+        storm_column = 'storm' if 'storm' in reader.fieldnames else 'stom'
+        rows = [(row['mars_date'][:10], row['temp'], row[storm_column]) for row in reader]
+    dates, temp, storm = zip(*rows) if rows else ((), (), ())
+    return WeatherSeries(np.array(dates, dtype='datetime64[D]'),
+                         np.array(temp, dtype=np.float64),
+                         np.array(storm, dtype=np.int64))
+
+# mars_weather 테이블에서 읽기 (MySQLHelper / PooledMySQLHelper / SQLiteHelper)
+def load_db(db):
+    rows = db.fetchall('SELECT mars_date, temp, storm FROM mars_weather ORDER BY mars_date')
+    dates = np.array([str(row[0])[:10] for row in rows], dtype='datetime64[D]')
+    temp = np.array([row[1] for row in rows], dtype=np.float64)
+    storm = np.array([row[2] for row in rows], dtype=np.int64)
+    return WeatherSeries(dates, temp, storm)
+
+# CSV를 읽되, 원본이 바뀌지 않았으면 .npz 스냅샷에서 바로 읽는 함수
+def load_cached(csv_file, snapshot_path=None):
+    snapshot_path = snapshot_path or os.path.splitext(csv_file)[0] + SNAPSHOT_SUFFIX
+    stat = os.stat(csv_file)
+    stamp = (stat.st_size, stat.st_mtime)
+
+    if os.path.exists(snapshot_path):
+        with np.load(snapshot_path) as data:
+            if tuple(data['source_stamp']) == stamp:
+                return WeatherSeries(data['dates'], data['temp'], data['storm'])
+
+    series = load_csv(csv_file)
+    series.save(snapshot_path, stamp)
+    return series
+
+def main():
+    parser = argparse.ArgumentParser(description='화성 기상 데이터 분석 (NumPy)')
+    parser.add_argument('--csv', default='mars_weathers_data.CSV')
+    parser.add_argument('--freq', choices=['D', 'W', 'M', 'Y'], default='M')
+    parser.add_argument('--window', type=int, default=7, help='이동 평균 기간 (일)')
+    parser.add_argument('--storm-threshold', type=int, default=80)
+    args = parser.parse_args()
+
+    series = load_cached(args.csv)
+    if len(series) == 0:
+        print(f'[*] {args.csv}에 분석할 데이터가 없습니다.')
+        return
+    print(f'[*] {len(series)}일치 데이터 ({series.dates[0]} ~ {series.dates[-1]})')
+
+    periods, means = series.resample(args.freq, 'temp', 'mean')
+    _, maxima = series.resample(args.freq, 'storm', 'max')
+    _, ratios = series.storm_ratio(args.storm_threshold, args.freq)
+    print(f'기간        평균기온  최대폭풍  폭풍일 비율(>={args.storm_threshold})')
+    for period, mean, peak, ratio in zip(periods, means, maxima, ratios):
+        print(f'{str(period):<10} {mean:>8.2f} {peak:>9.0f} {ratio:>12.1%}')
+
+    p10, p50, p90 = series.percentile([10, 50, 90])
+    print(f'기온 백분위수: 10%={p10:.2f}, 50%={p50:.2f}, 90%={p90:.2f}')
+    rolling = series.rolling_mean(args.window)
+    print(f'최근 {args.window}일 이동 평균 기온: {rolling[-1]:.2f}')
+
+if __name__ == '__main__':
+    main()
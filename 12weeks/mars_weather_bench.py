@@ -0,0 +1,120 @@
+import os
+import sys
+import csv
+import time
+import argparse
+import tempfile
+import threading
+from datetime import date, timedelta
+
+import mars_weather_summary as mws
+
+START_DAY = date(2050, 1, 1)
+MAX_DAYS = (date(9999, 12, 31) - START_DAY).days + 1
+
+# 원본 CSV를 반복해 rows행짜리 CSV를 만드는 함수 (weather_id는 계속 증가)
+# 날짜는 date 범위(9999년)를 넘지 않도록 MAX_DAYS마다 처음으로 돌아감
+def scale_csv(source_csv, target_csv, rows):
+    with open(source_csv, newline='') as file:
+        reader = csv.DictReader(file)
+        samples = [(row['temp'], row['stom']) for row in reader]
+
+    with open(target_csv, 'w', newline='') as file:
+        writer = csv.writer(file, lineterminator='\n')
+        writer.writerow(['weather_id', 'mars_date', 'temp', 'stom'])
+        for i in range(rows):
+            temp, storm = samples[i % len(samples)]
+            writer.writerow([i + 1, (START_DAY + timedelta(days=i % MAX_DAYS)).isoformat(), temp, storm])
+
+def truncate_all(db):
+    for table in ['mars_weather', 'ingest_checkpoint', *mws.ROLLUP_TABLES.values()]:
+        db.execute(f'TRUNCATE TABLE {table}')
+
+# 테이블을 비우고 적재 함수 하나를 실행해 초당 행 수를 반환하는 함수
+def run_strategy(db, label, ingest, *args):
+    truncate_all(db)
+    return mws.timed_ingest(label, ingest, db, *args)
+
+# mws 모듈의 함수 name이 calls번째 호출부터 예외를 내도록 바꿔서 ingest_upsert를 한 번 실행하는 함수
+def _interrupted_upsert(db, csv_file, chunk_bytes, name, fail_from):
+    original = getattr(mws, name)
+    calls, lock = [0], threading.Lock()
+
+    def flaky(*args):
+        with lock:
+            calls[0] += 1
+            failing = calls[0] >= fail_from
+        if failing:
+            raise RuntimeError(f'{name} 중단 시뮬레이션')
+        return original(*args)
+
+    setattr(mws, name, flaky)
+    try:
+        mws.ingest_upsert(db, csv_file, chunk_bytes)
+    except RuntimeError as e:
+        print(f'  중단됨: {e}')
+    finally:
+        setattr(mws, name, original)
+
+# upsert 적재가 중간에(청크 쓰기 도중 / 마지막 롤업 갱신 도중) 중단된 뒤 다시 실행했을 때
+# 롤업 합계가 원본 COUNT(*)와 맞는지 확인하는 함수
+def check_resume(db, csv_file, chunk_bytes=2000):
+    ok = True
+    for name, fail_from in [('write_chunk', 4), ('refresh_rollups', 1)]:
+        truncate_all(db)
+        _interrupted_upsert(db, csv_file, chunk_bytes, name, fail_from)
+        mws.ingest_upsert(db, csv_file, chunk_bytes)
+        rows = db.fetchall('SELECT COUNT(*) FROM mars_weather')[0][0]
+        mismatches = mws.verify_rollups(db)
+        print(f'[resume/{name}] 원본 {rows}행, 롤업 불일치: {mismatches or "없음"}')
+        ok = ok and not mismatches
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description='mars_weather 적재 방식 벤치마크')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='확장할 전체 행 수')
+    parser.add_argument('--row-limit', type=int, default=20_000,
+                        help='행 단위 방식은 느리므로 이 행 수까지만 측정')
+    parser.add_argument('--batch-size', type=int, default=mws.BATCH_SIZE)
+    parser.add_argument('--backend', choices=['sqlite', 'mysql'], default='sqlite')
+    parser.add_argument('--check-resume', action='store_true',
+                        help='중단 후 재실행한 upsert 적재의 롤업이 원본과 맞는지만 확인')
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    if args.check_resume:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = mws.connect_db(args.backend, pooled=True, sqlite_path=os.path.join(tmp, 'resume.db'))
+            mws.create_table(db)
+            mws.create_checkpoint_table(db)
+            mws.create_rollup_tables(db)
+            ok = check_resume(db, os.path.join(base_dir, 'mars_weathers_data.CSV'))
+        return 0 if ok else 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        big_csv = os.path.join(tmp, 'weather_big.csv')
+        small_csv = os.path.join(tmp, 'weather_small.csv')
+        start = time.perf_counter()
+        scale_csv(os.path.join(base_dir, 'mars_weathers_data.CSV'), big_csv, args.rows)
+        scale_csv(os.path.join(base_dir, 'mars_weathers_data.CSV'), small_csv, min(args.rows, args.row_limit))
+        print(f'[*] {args.rows:,}행 CSV 생성 ({time.perf_counter() - start:.1f}초), 백엔드: {args.backend}')
+
+        db = mws.connect_db(args.backend, pooled=True,
+                            sqlite_path=os.path.join(tmp, 'bench.db'))
+        plain = db if args.backend == 'sqlite' else mws.connect_db('mysql', allow_local_infile=True)
+        mws.create_table(db)
+        mws.create_checkpoint_table(db)
+        mws.create_rollup_tables(db)
+
+        rates = {
+            'row': run_strategy(plain, 'row', mws.insert_data_from_csv, small_csv),
+            'batch': run_strategy(plain, 'batch', mws.insert_data_bulk, big_csv, args.batch_size),
+            'bulk': run_strategy(plain, 'bulk', mws.load_data_infile, big_csv),
+            'upsert': run_strategy(db, 'upsert', mws.ingest_upsert, big_csv),
+        }
+        print('[*] 행 단위 대비 속도')
+        for label, rate in rates.items():
+            print(f'  {label:<7} {rate:>12,.0f}행/초  x{rate / rates["row"]:.1f}')
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,42 @@
 import csv
+import time
+import argparse
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from collections import deque
 import mysql.connector
+from mysql.connector import pooling
+from sqlite_helper import SQLiteHelper
+
+# DB 접속 정보
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '3535',  # 설치 시 지정한 비밀번호
+    'database': 'mars_db',
+}
+
+# 한 번의 트랜잭션으로 넣을 행 수
+BATCH_SIZE = 1000
+
+# 병렬 적재 시 한 청크의 크기 (바이트), 청크 하나가 트랜잭션 하나
+CHUNK_BYTES = 1 << 20
 
 # MySQL 연결과 쿼리 실행을 도와주는 헬퍼 클래스
 class MySQLHelper:
-    def __init__(self, host, user, password, database):
+    # 호출한 쪽이 백엔드와 관계없이 except db.Error로 처리할 수 있도록 노출
+    Error = mysql.connector.Error
+
+    def __init__(self, host, user, password, database, allow_local_infile=False):
         # DB 연결 수행
         self.connection = mysql.connector.connect(
             host=host,
             user=user,
             password=password,
-            database=database
+            database=database,
+            allow_local_infile=allow_local_infile  # LOAD DATA LOCAL INFILE 사용 여부
         )
         self.cursor = self.connection.cursor()
 
@@ -18,11 +45,147 @@ class MySQLHelper:
         self.cursor.execute(query, params)
         self.connection.commit()
 
+    # 여러 행을 한 번에 실행 (INSERT는 다중 행 INSERT 한 문장으로 변환됨), 커밋은 호출한 쪽에서
+    def executemany(self, query, seq_params):
+        self.cursor.executemany(query, seq_params)
+
+    # 조회 쿼리 실행 후 모든 행 반환
+    def fetchall(self, query, params=None):
+        self.cursor.execute(query, params)
+        return self.cursor.fetchall()
+
+    # 현재 트랜잭션 확정 / 취소
+    def commit(self):
+        self.connection.commit()
+
+    def rollback(self):
+        self.connection.rollback()
+
+    # 서버의 LOAD DATA LOCAL INFILE로 CSV를 한 번에 적재 (가장 빠름)
+    # 서버에 local_infile=ON, 연결에 allow_local_infile=True 설정이 필요함
+    def bulk_load_csv(self, csv_file):
+        query = (
+            'LOAD DATA LOCAL INFILE %s INTO TABLE mars_weather '
+            "FIELDS TERMINATED BY ',' LINES TERMINATED BY '\\n' IGNORE 1 LINES "
+            '(@weather_id, mars_date, @temp, @stom) '
+            'SET temp = TRUNCATE(@temp, 0), storm = @stom'
+        )
+        self.execute(query, (os.path.abspath(csv_file),))
+        return self.cursor.rowcount
+
     # 연결 종료
     def close(self):
         self.cursor.close()
         self.connection.close()
 
+# 트랜잭션 하나 동안 사용할 커서 묶음 (같은 쿼리는 준비된 문장을 재사용)
+class Transaction:
+    def __init__(self, connection, prepared=None):
+        self.connection = connection
+        self.cursor = connection.cursor()
+        # 쿼리 문자열 -> 준비된 문장 커서
+        # PooledMySQLHelper는 연결별 딕셔너리를 넘겨서 트랜잭션이 끝나도 같은 연결에서 계속 재사용
+        self._owns_prepared = prepared is None
+        self._prepared = {} if prepared is None else prepared
+
+    def _prepared_cursor(self, query):
+        cursor = self._prepared.get(query)
+        if cursor is None:
+            cursor = self.connection.cursor(prepared=True)
+            self._prepared[query] = cursor
+        return cursor
+
+    # prepared=True면 서버에 한 번 준비한 문장을 재사용 (반복 실행되는 짧은 쿼리용)
+    def execute(self, query, params=None, prepared=False):
+        cursor = self._prepared_cursor(query) if prepared else self.cursor
+        cursor.execute(query, params)
+        return cursor
+
+    def executemany(self, query, seq_params):
+        self.cursor.executemany(query, seq_params)
+        return self.cursor
+
+    def fetchall(self, query, params=None, prepared=False):
+        return self.execute(query, params, prepared).fetchall()
+
+    def close(self):
+        if self._owns_prepared:
+            for cursor in self._prepared.values():
+                cursor.close()
+        self.cursor.close()
+
+# 연결 풀을 사용하는 헬퍼 클래스 (여러 작업이 제한된 수의 연결을 나눠 씀)
+class PooledMySQLHelper:
+    Error = mysql.connector.Error
+
+    def __init__(self, host, user, password, database, pool_size=5, pool_name='mars_pool', **options):
+        self.pool = pooling.MySQLConnectionPool(
+            pool_name=pool_name,
+            pool_size=pool_size,
+            host=host,
+            user=user,
+            password=password,
+            database=database,
+            # 반납할 때 세션을 초기화하면 서버의 준비된 문장이 해제되므로 끔
+            pool_reset_session=False,
+            **options
+        )
+        # 풀이 비면 mysql.connector는 바로 오류를 내므로, 빈 연결이 생길 때까지 기다리도록 제한
+        self._available = threading.BoundedSemaphore(pool_size)
+        # 연결 ID -> {쿼리: 준비된 문장 커서}, 같은 연결을 다시 빌리면 준비된 문장을 그대로 사용
+        self._statements = {}
+        self._statements_lock = threading.Lock()
+
+    # 풀에서 연결을 빌려 상태를 확인한 뒤 사용하고, 끝나면 풀에 반납
+    @contextmanager
+    def connection(self):
+        with self._available:
+            conn = self.pool.get_connection()
+            try:
+                old_id = conn.connection_id
+                conn.ping(reconnect=True, attempts=3, delay=1)  # 끊긴 연결이면 다시 연결
+                if conn.connection_id != old_id:
+                    # 다시 연결되면 이전 세션의 준비된 문장은 서버에서 사라졌으므로 버림
+                    with self._statements_lock:
+                        self._statements.pop(old_id, None)
+                yield conn
+            finally:
+                conn.close()  # 풀 연결의 close는 실제 종료가 아니라 반납
+
+    # with helper.transaction() as tx: 블록이 정상 종료되면 커밋, 예외가 나면 롤백
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            with self._statements_lock:
+                prepared = self._statements.setdefault(conn.connection_id, {})
+            tx = Transaction(conn, prepared)
+            try:
+                yield tx
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                tx.close()
+
+    # MySQLHelper와 같은 방식으로 쓸 수 있는 단일 쿼리 실행
+    def execute(self, query, params=None):
+        with self.transaction() as tx:
+            tx.execute(query, params)
+
+    # 조회는 준비된 문장으로 (체크포인트/롤업 확인처럼 같은 쿼리를 반복하는 경우가 많음)
+    def fetchall(self, query, params=None):
+        with self.transaction() as tx:
+            return tx.fetchall(query, params, prepared=True)
+
+    # 연결 상태 확인
+    def is_healthy(self):
+        try:
+            with self.connection() as conn:
+                return conn.is_connected()
+        except mysql.connector.Error:
+            return False
+
 # mars_weather 테이블 생성 함수
 def create_table(db):
     create_query = (
@@ -34,33 +197,411 @@ def create_table(db):
     )
     db.execute(create_query)
 
-# CSV 파일을 읽고 테이블에 삽입하는 함수
+INSERT_QUERY = (
+    'INSERT INTO mars_weather (mars_date, temp, storm) '
+    'VALUES (%s, %s, %s)'
+)
+
+# CSV 한 행을 테이블에 넣을 값으로 변환하는 함수
+def parse_row(row):
+    mars_date = row['mars_date']  # 날짜 그대로 사용
+    temp = int(float(row['temp']))  # 소수 → 정수 변환
+    storm = int(row['stom'])  # CSV 오타(stom)를 storm으로 수정
+    return mars_date, temp, storm
+
+# CSV 파일을 읽고 테이블에 삽입하는 함수 (한 행마다 커밋)
 def insert_data_from_csv(db, csv_file):
+    count = 0
+    dates = []
     with open(csv_file, newline='') as file:
         reader = csv.DictReader(file)
         for row in reader:
-            insert_query = (
-                'INSERT INTO mars_weather (mars_date, temp, storm) '
-                'VALUES (%s, %s, %s)'
-            )
-            mars_date = row['mars_date']  # 날짜 그대로 사용
-            temp = int(float(row['temp']))  # 소수 → 정수 변환
-            storm = int(row['stom'])  # CSV 오타(stom)를 storm으로 수정
-            db.execute(insert_query, (mars_date, temp, storm))
+            values = parse_row(row)
+            db.execute(INSERT_QUERY, values)
+            dates.append(values[0])
+            count += 1
+    if dates:
+        refresh_rollups(db, min(dates), max(dates))
+        db.commit()
+    return count
+
+# CSV 파일을 batch_size 행씩 묶어 다중 행 INSERT + 배치당 한 번 커밋으로 삽입하는 함수
+def insert_data_bulk(db, csv_file, batch_size=BATCH_SIZE):
+    count = 0
+    batch = []
+    with open(csv_file, newline='') as file:
+        for row in csv.DictReader(file):
+            batch.append(parse_row(row))
+            if len(batch) >= batch_size:
+                count += _insert_batch(db, batch)
+                batch = []
+    if batch:
+        count += _insert_batch(db, batch)
+    return count
+
+def _insert_batch(db, batch):
+    try:
+        db.executemany(INSERT_QUERY, batch)
+        # 같은 트랜잭션에서 이 배치가 속한 기간의 롤업도 갱신
+        dates = [row[0] for row in batch]
+        refresh_rollups(db, min(dates), max(dates))
+        db.commit()
+    except db.Error:
+        db.rollback()  # 실패한 배치는 통째로 취소
+        raise
+    return len(batch)
+
+# 백엔드의 일괄 적재 기능으로 CSV를 한 번에 적재하는 함수 (가장 빠름)
+# MySQL은 LOAD DATA LOCAL INFILE, SQLite는 한 트랜잭션의 executemany
+def load_data_infile(db, csv_file):
+    count = db.bulk_load_csv(csv_file)
+    # 테이블 전체가 아니라 이번에 적재한 CSV의 기간만 롤업 갱신
+    first, last = csv_date_range(csv_file)
+    if first is not None:
+        refresh_rollups(db, first, last)
+        db.commit()
+    return count
+
+# CSV의 mars_date 열만 훑어 (가장 이른 날짜, 가장 늦은 날짜)를 구하는 함수
+def csv_date_range(csv_file):
+    first = last = None
+    with open(csv_file, newline='') as file:
+        reader = csv.reader(file)
+        column = [name.strip() for name in next(reader, [])].index('mars_date')
+        for record in reader:
+            if not record:
+                continue
+            day = record[column][:10]
+            if first is None or day < first:
+                first = day
+            if last is None or day > last:
+                last = day
+    return first, last
+
+# ===== 요약(롤업) 테이블 =====
+
+# 기간 단위별 롤업 테이블 이름
+ROLLUP_TABLES = {
+    'daily': 'weather_rollup_daily',
+    'monthly': 'weather_rollup_monthly',
+    'yearly': 'weather_rollup_yearly',
+}
+
+# 일/월/년 단위 롤업 테이블 생성 함수 (평균은 합계/개수로 계산)
+def create_rollup_tables(db):
+    for table in ROLLUP_TABLES.values():
+        db.execute(
+            f'CREATE TABLE IF NOT EXISTS {table} ('
+            'period CHAR(10) PRIMARY KEY, '   # 'YYYY-MM-DD' / 'YYYY-MM' / 'YYYY'
+            'row_count INT NOT NULL, '
+            'temp_sum BIGINT, temp_min INT, temp_max INT, '
+            'storm_sum BIGINT, storm_max INT, storm_days INT)'
+        )
+    # 날짜 범위로 원본을 다시 집계하므로 mars_date 인덱스가 필요함
+    try:
+        db.execute('CREATE INDEX idx_mars_weather_date ON mars_weather (mars_date)')
+    except db.Error as e:
+        if getattr(e, 'errno', None) != 1061:  # 이미 있는 인덱스
+            raise
+
+# 새로 들어온 행이 속한 기간만 다시 집계하는 함수 (전체 재계산 없음)
+# 호출한 쪽의 트랜잭션 안에서 실행되며 커밋하지 않음
+def refresh_rollups(db, first_date, last_date):
+    first_day, last_day = str(first_date)[:10], str(last_date)[:10]
+    run = db.cursor.execute
+
+    # 행이 다른 날짜로 옮겨져 비게 된 기간이 남지 않도록 범위 안의 기존 롤업을 먼저 지움
+    run('DELETE FROM weather_rollup_daily WHERE period >= %s AND period <= %s', (first_day, last_day))
+    run('DELETE FROM weather_rollup_monthly WHERE period >= %s AND period <= %s',
+        (first_day[:7], last_day[:7]))
+    run('DELETE FROM weather_rollup_yearly WHERE period >= %s AND period <= %s',
+        (first_day[:4], last_day[:4]))
+
+    # 일 단위: 해당 날짜 범위의 원본 행을 다시 집계
+    run(
+        'REPLACE INTO weather_rollup_daily '
+        'SELECT DATE(mars_date), COUNT(*), SUM(temp), MIN(temp), MAX(temp), '
+        'SUM(storm), MAX(storm), SUM(storm > 0) '
+        'FROM mars_weather WHERE mars_date >= %s AND mars_date < DATE_ADD(%s, INTERVAL 1 DAY) '
+        'GROUP BY DATE(mars_date)',
+        (first_day, last_day)
+    )
+    # 월 단위: 해당 월들의 일 단위 롤업을 합침
+    run(
+        'REPLACE INTO weather_rollup_monthly '
+        'SELECT LEFT(period, 7), SUM(row_count), SUM(temp_sum), MIN(temp_min), MAX(temp_max), '
+        'SUM(storm_sum), MAX(storm_max), SUM(storm_days) '
+        'FROM weather_rollup_daily WHERE period >= %s AND period < %s '
+        'GROUP BY LEFT(period, 7)',
+        (first_day[:7], last_day[:7] + '~')  # '~'는 숫자/하이픈보다 뒤에 정렬됨
+    )
+    # 년 단위: 해당 연도들의 월 단위 롤업을 합침
+    run(
+        'REPLACE INTO weather_rollup_yearly '
+        'SELECT LEFT(period, 4), SUM(row_count), SUM(temp_sum), MIN(temp_min), MAX(temp_max), '
+        'SUM(storm_sum), MAX(storm_max), SUM(storm_days) '
+        'FROM weather_rollup_monthly WHERE period >= %s AND period < %s '
+        'GROUP BY LEFT(period, 4)',
+        (first_day[:4], last_day[:4] + '~')
+    )
+
+# 롤업 테이블에서 기간별 요약을 읽어오는 함수
+def query_rollup(db, granularity='monthly', start=None, end=None):
+    """
+    :param granularity: 'daily', 'monthly', 'yearly'
+    :param start, end: 기간 범위 (예: '2050-01', '2050-12'), 생략하면 전체
+    :return: 기간별 요약 딕셔너리 목록
+    """
+    query = (
+        'SELECT period, row_count, temp_min, temp_max, temp_sum * 1.0 / row_count, '
+        'storm_sum, storm_max, storm_days '
+        f'FROM {ROLLUP_TABLES[granularity]} WHERE period >= %s AND period <= %s ORDER BY period'
+    )
+    rows = db.fetchall(query, (start or '', (end or '9999') + '~'))
+    keys = ('period', 'count', 'temp_min', 'temp_max', 'temp_avg', 'storm_total', 'storm_max', 'storm_days')
+    return [dict(zip(keys, row)) for row in rows]
+
+# 롤업 요약을 표 형태로 출력하는 함수
+def print_summary(db, granularity='yearly'):
+    print(f'=== 화성 기상 요약 ({granularity}) ===')
+    print('기간        개수   최저  최고   평균   폭풍합계  폭풍최대  폭풍일수')
+    for r in query_rollup(db, granularity):
+        print(f"{r['period']:<10} {r['count']:>5} {r['temp_min']:>5} {r['temp_max']:>5} "
+              f"{float(r['temp_avg']):>6.1f} {r['storm_total']:>9} {r['storm_max']:>8} {r['storm_days']:>8}")
+
+# ===== 병렬 + 재시작 가능한 upsert 적재 =====
+
+# CSV의 weather_id를 키로 사용하므로 다시 실행해도 행이 중복되지 않음
+UPSERT_QUERY = (
+    'INSERT INTO mars_weather (weather_id, mars_date, temp, storm) '
+    'VALUES (%s, %s, %s, %s) '
+    'ON DUPLICATE KEY UPDATE mars_date = VALUES(mars_date), '
+    'temp = VALUES(temp), storm = VALUES(storm)'
+)
+
+# 완료된 청크의 바이트 범위와 날짜 범위를 기록하는 체크포인트 테이블 생성 함수
+# 날짜 범위는 중단 후 재실행해도 이전 실행에서 커밋된 청크의 롤업까지 갱신하기 위해 사용
+def create_checkpoint_table(db):
+    db.execute(
+        'CREATE TABLE IF NOT EXISTS ingest_checkpoint ('
+        'source VARCHAR(255) NOT NULL, '
+        'chunk_start BIGINT NOT NULL, '
+        'chunk_end BIGINT NOT NULL, '
+        'first_date CHAR(10), '
+        'last_date CHAR(10), '
+        'PRIMARY KEY (source, chunk_start))'
+    )
+    # 날짜 열이 없던 이전 버전의 테이블이면 열 추가
+    try:
+        db.fetchall('SELECT first_date, last_date FROM ingest_checkpoint WHERE 1 = 0')
+    except db.Error:
+        db.execute('ALTER TABLE ingest_checkpoint ADD COLUMN first_date CHAR(10)')
+        db.execute('ALTER TABLE ingest_checkpoint ADD COLUMN last_date CHAR(10)')
+
+# 파일을 줄 경계에 맞춘 (시작, 끝) 바이트 범위들로 나누는 함수
+def chunk_ranges(csv_file, chunk_bytes=CHUNK_BYTES):
+    size = os.path.getsize(csv_file)
+    ranges = []
+    with open(csv_file, 'rb') as file:
+        file.readline()  # 헤더 건너뜀
+        start = file.tell()
+        while start < size:
+            file.seek(min(start + chunk_bytes, size))
+            file.readline()  # 다음 줄 끝까지 포함
+            end = min(file.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+# 헤더를 읽어 열 이름 -> 위치를 구하는 함수 (stom/storm 오타 모두 허용)
+def read_header(csv_file):
+    with open(csv_file, newline='') as file:
+        header = next(csv.reader(file))
+    columns = {name.strip(): i for i, name in enumerate(header)}
+    if 'storm' not in columns:
+        columns['storm'] = columns['stom']
+    return columns
+
+# 청크 하나를 읽어 (weather_id, mars_date, temp, storm) 목록으로 변환하는 함수 (프로세스에서 실행)
+def parse_chunk(csv_file, start, end, columns):
+    with open(csv_file, 'rb') as file:
+        file.seek(start)
+        lines = file.read(end - start).decode('utf-8').splitlines()
+    rows = []
+    for record in csv.reader(lines):
+        if not record:
+            continue
+        rows.append((
+            int(record[columns['weather_id']]),
+            record[columns['mars_date']],
+            int(float(record[columns['temp']])),
+            int(record[columns['storm']]),
+        ))
+    return start, end, rows
+
+# 청크 하나를 upsert하고 같은 트랜잭션에서 체크포인트(날짜 범위 포함)를 기록하는 함수 (스레드에서 실행)
+# upsert가 기존 weather_id의 날짜를 바꾸면 옮기기 전 날짜의 롤업도 다시 집계해야 하므로
+# 이 청크의 weather_id 범위에 이미 있던 행의 날짜도 날짜 범위에 포함함
+def write_chunk(helper, source, start, end, rows):
+    days = [row[1][:10] for row in rows]
+    with helper.transaction() as tx:
+        if rows:
+            # upsert 자체는 다중 행 INSERT로 바뀌는 일반 커서의 executemany가 더 빠름
+            # (준비된 문장 커서의 executemany는 행마다 따로 실행됨)
+            ids = [row[0] for row in rows]
+            old_first, old_last = tx.fetchall(
+                'SELECT MIN(mars_date), MAX(mars_date) FROM mars_weather '
+                'WHERE weather_id >= %s AND weather_id <= %s', (min(ids), max(ids)), prepared=True
+            )[0]
+            if old_first is not None:
+                days += [str(old_first)[:10], str(old_last)[:10]]
+            tx.executemany(UPSERT_QUERY, rows)
+        first, last = (min(days), max(days)) if days else (None, None)
+        tx.execute(
+            'INSERT INTO ingest_checkpoint (source, chunk_start, chunk_end, first_date, last_date) '
+            'VALUES (%s, %s, %s, %s, %s) '
+            'ON DUPLICATE KEY UPDATE chunk_end = VALUES(chunk_end), '
+            'first_date = VALUES(first_date), last_date = VALUES(last_date)',
+            (source, start, end, first, last), prepared=True
+        )
+    return len(rows)
+
+# CSV를 청크로 나눠 여러 프로세스로 파싱하고, 풀 연결 여러 개로 upsert하는 함수
+# 중단된 뒤 다시 실행하면 체크포인트에 기록된 청크는 건너뜀
+# 파싱/쓰기 중인 청크 수를 제한하므로 파일이 커도 메모리에는 몇 개의 청크만 올라감
+def ingest_upsert(helper, csv_file, chunk_bytes=CHUNK_BYTES, parse_workers=None, write_workers=4):
+    # 같은 크기로 수정된 파일을 같은 파일로 보지 않도록 수정 시각도 키에 포함
+    stat = os.stat(csv_file)
+    source = f'{os.path.basename(csv_file)}:{stat.st_size}:{stat.st_mtime_ns}'
+    done = {start for (start,) in helper.fetchall(
+        'SELECT chunk_start FROM ingest_checkpoint WHERE source = %s', (source,)
+    )}
+    ranges = [r for r in chunk_ranges(csv_file, chunk_bytes) if r[0] not in done]
+    if done:
+        print(f'[upsert] 완료된 청크 {len(done)}개를 건너뛰고 남은 {len(ranges)}개를 적재')
+
+    columns = read_header(csv_file)
+    count = 0
+    with ProcessPoolExecutor(parse_workers) as parsers, ThreadPoolExecutor(write_workers) as writers:
+        parse_window = (parse_workers or os.cpu_count() or 1) * 2
+        write_window = write_workers * 2
+        todo = iter(ranges)
+        parsing, writing = deque(), deque()
+        while True:
+            # 파싱 중인 청크가 parse_window개가 되도록 채움
+            while len(parsing) < parse_window:
+                chunk = next(todo, None)
+                if chunk is None:
+                    break
+                parsing.append(parsers.submit(parse_chunk, csv_file, chunk[0], chunk[1], columns))
+            if not parsing:
+                break
+
+            s, e, rows = parsing.popleft().result()
+            writing.append(writers.submit(write_chunk, helper, source, s, e, rows))
+            # 쓰기가 밀리면 파싱된 청크가 쌓이지 않도록 먼저 끝나기를 기다림
+            while len(writing) > write_window:
+                count += writing.popleft().result()
+        for future in writing:
+            count += future.result()
+
+    # 청크들이 동시에 같은 월/연도를 갱신하면 서로의 결과를 못 볼 수 있으므로
+    # 모든 청크가 커밋된 뒤 한 번에 다시 집계. 이전 실행에서 커밋되고 롤업은 갱신되지 못한
+    # 청크(중단된 경우)도 포함하도록 이 파일의 모든 체크포인트의 날짜 범위를 사용
+    first, last = helper.fetchall(
+        'SELECT MIN(first_date), MAX(last_date) FROM ingest_checkpoint WHERE source = %s', (source,)
+    )[0]
+    if first is not None:
+        with helper.transaction() as tx:
+            refresh_rollups(tx, first, last)
+    return count
+
+# 롤업 테이블들의 행 수 합계가 원본 행 수와 같은지 확인하는 함수
+# :return: 맞지 않는 {롤업 테이블: 합계} (모두 맞으면 빈 딕셔너리)
+def verify_rollups(db):
+    expected = db.fetchall('SELECT COUNT(*) FROM mars_weather')[0][0]
+    mismatches = {}
+    for table in ROLLUP_TABLES.values():
+        total = db.fetchall(f'SELECT COALESCE(SUM(row_count), 0) FROM {table}')[0][0]
+        if int(total) != expected:
+            mismatches[table] = int(total)
+    return mismatches
+
+# 적재 함수 실행 시간을 재고 초당 행 수를 출력하는 함수
+def timed_ingest(label, ingest, *args):
+    start = time.perf_counter()
+    rows = ingest(*args)
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed else 0.0
+    print(f'[{label}] {rows}행, {elapsed:.2f}초, {rate:,.0f}행/초')
+    return rate
+
+INGEST_MODES = {
+    'row': lambda db, csv_file, batch_size: insert_data_from_csv(db, csv_file),
+    'batch': insert_data_bulk,
+    'infile': lambda db, csv_file, batch_size: load_data_infile(db, csv_file),
+}
+
+# 사용할 DB 백엔드의 헬퍼를 만드는 함수
+# mysql: 실제 서버 (pooled=True면 연결 풀), sqlite: 서버 없이 같은 API로 동작하는 대체 백엔드
+def connect_db(backend='mysql', pooled=False, pool_size=4, allow_local_infile=False,
+               sqlite_path='mars_weather.db'):
+    if backend == 'sqlite':
+        return SQLiteHelper(sqlite_path)
+    if pooled:
+        return PooledMySQLHelper(**DB_CONFIG, pool_size=pool_size)
+    return MySQLHelper(**DB_CONFIG, allow_local_infile=allow_local_infile)
 
 # 전체 실행 흐름을 제어하는 메인 함수
 def main():
-    db = MySQLHelper(
-        host='localhost',
-        user='root',
-        password='3535',  # 설치 시 지정한 비밀번호
-        database='mars_db'
-    )
+    parser = argparse.ArgumentParser(description='mars_weather 데이터 적재')
+    parser.add_argument('--mode', choices=list(INGEST_MODES) + ['upsert'], default='batch',
+                        help='row: 행마다 커밋, batch: 다중 행 INSERT, infile: LOAD DATA LOCAL INFILE, '
+                             'upsert: 병렬 + 재시작 가능한 weather_id 기준 upsert')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=4, help='upsert 모드의 동시 연결 수')
+    parser.add_argument('--compare', action='store_true',
+                        help='모든 방식을 차례로 실행해 초당 행 수를 비교 (테이블을 비우고 시작)')
+    parser.add_argument('--csv', default='mars_weathers_data.CSV')
+    parser.add_argument('--backend', choices=['mysql', 'sqlite'], default='mysql',
+                        help='sqlite: MySQL 서버 없이 로컬 SQLite 파일로 실행')
+    parser.add_argument('--sqlite-path', default='mars_weather.db')
+    parser.add_argument('--summary', choices=list(ROLLUP_TABLES), default='yearly',
+                        help='적재 후 출력할 요약 단위')
+    args = parser.parse_args()
+
+    if args.mode == 'upsert' and not args.compare:
+        helper = connect_db(args.backend, pooled=True, pool_size=args.workers,
+                            sqlite_path=args.sqlite_path)
+        create_table(helper)  # 테이블 생성
+        create_checkpoint_table(helper)
+        create_rollup_tables(helper)
+        timed_ingest('upsert', ingest_upsert, helper, args.csv, CHUNK_BYTES, None, args.workers)
+        print_summary(helper, args.summary)
+        return
+
+    db = connect_db(args.backend, allow_local_infile=args.compare or args.mode == 'infile',
+                    sqlite_path=args.sqlite_path)
 
     create_table(db)  # 테이블 생성
-    insert_data_from_csv(db, 'mars_weathers_data.CSV')  # 데이터 삽입
+    create_rollup_tables(db)
+    if args.compare:
+        baseline = None
+        for mode, ingest in INGEST_MODES.items():
+            for table in ['mars_weather', *ROLLUP_TABLES.values()]:
+                db.execute(f'TRUNCATE TABLE {table}')
+            try:
+                rate = timed_ingest(mode, ingest, db, args.csv, args.batch_size)
+            except db.Error as e:
+                print(f'[{mode}] 실행 실패: {e}')
+                continue
+            baseline = baseline or rate
+            print(f'[{mode}] 행 단위 대비 x{rate / baseline:.1f}')
+    else:
+        timed_ingest(args.mode, INGEST_MODES[args.mode], db, args.csv, args.batch_size)  # 데이터 삽입
+    print_summary(db, args.summary)
     db.close()  # DB 연결 종료
 
 # 실행
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,4 +1,18 @@
 import csv
+import mmap
+import os
+import re
+import time
+import argparse
+import difflib
+
+# mars_weather 테이블이 기대하는 열 이름 (헤더 오타 검사용)
+EXPECTED_COLUMNS = ['weather_id', 'mars_date', 'temp', 'storm']
+
+# 빈 값으로 취급할 문자열
+NULL_VALUES = {'', 'null', 'none', 'na', 'n/a', 'nan'}
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2})?)?$')
 
 def read_csv_preview(filename):
     with open(filename, newline='') as file:
@@ -8,5 +22,149 @@ def read_csv_preview(filename):
             if i == 4:  # 5개만 미리보기
                 break
 
+# 파일 전체 바이트 범위에서 고르게 줄을 뽑아오는 함수 (파일 크기와 관계없이 samples개만 읽음)
+def sample_lines(filename, samples=1000):
+    """
+    :return: (헤더 줄, 표본 줄 목록, 평균 줄 길이(바이트))
+    따옴표 안에 줄바꿈이 있는 CSV는 줄 경계를 잘못 잡을 수 있음
+    """
+    with open(filename, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return '', [], 0
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            header_end = mm.find(b'\n')
+            header_end = size if header_end < 0 else header_end + 1
+            header = mm[:header_end].decode('utf-8', errors='replace')
+
+            lines, seen = [], set()
+            span = size - header_end
+            step = max(1, span // samples) if span > 0 else 1
+            for offset in range(header_end, size, step):
+                # 임의 위치는 줄 중간일 수 있으므로 이전 줄바꿈 다음부터를 한 줄로 봄
+                start = mm.rfind(b'\n', header_end - 1, offset) + 1 if offset > header_end else header_end
+                if start in seen:
+                    continue
+                seen.add(start)
+                end = mm.find(b'\n', start)
+                end = size if end < 0 else end + 1
+                lines.append(mm[start:end].decode('utf-8', errors='replace'))
+                if len(lines) >= samples:
+                    break
+
+    avg_len = sum(len(line.encode('utf-8')) for line in lines) / len(lines) if lines else 0
+    return header, lines, avg_len
+
+# 값 하나의 타입을 추정하는 함수
+def _value_type(value):
+    try:
+        int(value)
+        return 'int'
+    except ValueError:
+        pass
+    try:
+        float(value)
+        return 'float'
+    except ValueError:
+        pass
+    return 'date' if DATE_PATTERN.match(value) else 'str'
+
+# 표본 행들로 열별 타입, 빈 값 비율, 값 범위를 추정하는 함수
+def infer_schema(columns, rows):
+    schema = []
+    for i, name in enumerate(columns):
+        values = [row[i].strip() if i < len(row) else '' for row in rows]
+        present = [v for v in values if v.lower() not in NULL_VALUES]
+        types = {_value_type(v) for v in present}
+
+        # 여러 타입이 섞이면 더 넓은 타입으로 (int < float < str)
+        if not types:
+            col_type = 'unknown'
+        elif types <= {'int'}:
+            col_type = 'int'
+        elif types <= {'int', 'float'}:
+            col_type = 'float'
+        elif types == {'date'}:
+            col_type = 'date'
+        else:
+            col_type = 'str'
+
+        info = {
+            'name': name,
+            'type': col_type,
+            'null_rate': 1 - len(present) / len(values) if values else 0.0,
+            'min': None,
+            'max': None,
+            'notes': [],
+        }
+        if col_type in ('int', 'float'):
+            numbers = [float(v) for v in present]
+            cast = int if col_type == 'int' else float
+            info['min'], info['max'] = cast(min(numbers)), cast(max(numbers))
+            if col_type == 'float' and all(n.is_integer() for n in numbers):
+                info['notes'].append('소수점 표기지만 값은 모두 정수')
+            if col_type == 'float' and 'int' in types:
+                info['notes'].append('정수와 소수가 섞여 있음')
+        elif col_type == 'date':
+            info['min'], info['max'] = min(present), max(present)
+        elif len(types) > 1:
+            info['notes'].append(f"타입 혼재: {', '.join(sorted(types))}")
+        schema.append(info)
+    return schema
+
+# 헤더 이름 문제(오타, 공백, 중복, 누락)를 찾는 함수
+def check_header(columns, expected=EXPECTED_COLUMNS):
+    problems = []
+    stripped = [c.strip() for c in columns]
+    for raw, name in zip(columns, stripped):
+        if raw != name:
+            problems.append(f"'{raw}' 앞뒤에 공백이 있음")
+        if name not in expected:
+            guess = difflib.get_close_matches(name, expected, n=1, cutoff=0.6)
+            hint = f" ('{guess[0]}'의 오타?)" if guess else ''
+            problems.append(f"예상하지 않은 열 '{name}'{hint}")
+    for name in sorted({n for n in stripped if stripped.count(n) > 1}):
+        problems.append(f"중복된 열 '{name}'")
+    for name in expected:
+        if name not in stripped:
+            problems.append(f"열 '{name}' 없음")
+    return problems
+
+# 대용량 CSV를 표본 추출로 빠르게 살펴보는 함수
+def sample_preview(filename, samples=1000):
+    start = time.perf_counter()
+    header, lines, avg_len = sample_lines(filename, samples)
+    columns = next(csv.reader([header]), [])
+    rows = [row for row in csv.reader(lines) if row]
+    schema = infer_schema(columns, rows)
+    problems = check_header(columns)
+    elapsed = time.perf_counter() - start
+
+    size = os.path.getsize(filename)
+    estimated_rows = int((size - len(header.encode('utf-8'))) / avg_len) if avg_len else 0
+    print(f'파일: {filename} ({size / 1e6:.1f}MB, 약 {estimated_rows:,}행, 표본 {len(rows)}행, {elapsed * 1000:.0f}ms)')
+    print(f"{'열':<12} {'타입':<8} {'빈 값':>6} {'최소':>12} {'최대':>12}  비고")
+    for col in schema:
+        low = '' if col['min'] is None else col['min']
+        high = '' if col['max'] is None else col['max']
+        print(f"{col['name']:<12} {col['type']:<8} {col['null_rate']:>6.1%} {str(low):>12} {str(high):>12}  "
+              f"{'; '.join(col['notes'])}")
+    for problem in problems:
+        print(f'[헤더 경고] {problem}')
+    return schema, problems
+
+def main():
+    parser = argparse.ArgumentParser(description='CSV 미리보기')
+    parser.add_argument('file', nargs='?', default='mars_weathers_data.CSV')
+    parser.add_argument('--sample', action='store_true',
+                        help='파일 전체에서 표본을 뽑아 열 타입/빈 값/범위를 추정')
+    parser.add_argument('--samples', type=int, default=1000, help='표본으로 읽을 줄 수')
+    args = parser.parse_args()
+
+    if args.sample:
+        sample_preview(args.file, args.samples)
+    else:
+        read_csv_preview(args.file)
+
 if __name__ == '__main__':
-    read_csv_preview('mars_weathers_data.CSV')
+    main()
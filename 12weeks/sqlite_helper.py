@@ -0,0 +1,138 @@
+import csv
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+# MySQL 문법 -> SQLite 문법 변환 규칙 (이 폴더의 쿼리에서 쓰는 것만)
+_REWRITES = [
+    (re.compile(r'INT AUTO_INCREMENT PRIMARY KEY'), 'INTEGER PRIMARY KEY'),
+    (re.compile(r'^TRUNCATE TABLE (\w+)'), r'DELETE FROM \1'),
+    (re.compile(r'CREATE INDEX (?!IF NOT EXISTS)'), 'CREATE INDEX IF NOT EXISTS '),
+    (re.compile(r'DATE_ADD\(([^,()]+), INTERVAL (\d+) DAY\)'), r"DATE(\1, '+\2 day')"),
+    (re.compile(r'\bLEFT\(([^,()]+), (\d+)\)'), r'SUBSTR(\1, 1, \2)'),
+]
+
+# MySQL용 쿼리(%s 파라미터)를 SQLite용 쿼리(? 파라미터)로 바꾸는 함수
+@lru_cache(maxsize=256)
+def translate_query(query):
+    head, sep, tail = query.partition('ON DUPLICATE KEY UPDATE')
+    if sep:
+        # ON DUPLICATE KEY UPDATE col = VALUES(col) -> ON CONFLICT DO UPDATE SET col = excluded.col
+        head += 'ON CONFLICT DO UPDATE SET'
+        tail = re.sub(r'VALUES\((\w+)\)', r'excluded.\1', tail)
+    query = head + tail
+    for pattern, replacement in _REWRITES:
+        query = pattern.sub(replacement, query)
+    return query.replace('%s', '?')
+
+# 쿼리를 변환해서 실행하는 커서 (mysql.connector 커서와 같은 방식으로 사용)
+class TranslatingCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, params=None):
+        self._cursor.execute(translate_query(query), params or ())
+
+    def executemany(self, query, seq_params):
+        self._cursor.executemany(translate_query(query), seq_params)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+# SQLiteHelper.transaction()이 돌려주는 객체 (PooledMySQLHelper의 Transaction과 같은 사용법)
+class SQLiteTransaction:
+    def __init__(self, connection):
+        self.cursor = TranslatingCursor(connection.cursor())
+
+    def execute(self, query, params=None, prepared=False):
+        self.cursor.execute(query, params)
+        return self.cursor
+
+    def executemany(self, query, seq_params):
+        self.cursor.executemany(query, seq_params)
+        return self.cursor
+
+    def fetchall(self, query, params=None, prepared=False):
+        return self.execute(query, params).fetchall()
+
+    def close(self):
+        self.cursor.close()
+
+# MySQL 서버 없이 테스트/벤치마크할 수 있는 SQLite 헬퍼 (MySQLHelper, PooledMySQLHelper와 같은 사용법)
+class SQLiteHelper:
+    # MySQL 헬퍼들과 같이 except db.Error로 처리할 수 있도록 노출
+    Error = sqlite3.Error
+
+    def __init__(self, path=':memory:'):
+        # 여러 스레드에서 쓰는 경우(upsert 모드)를 위해 연결 하나를 잠금으로 보호
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.cursor = TranslatingCursor(self.connection.cursor())
+        self._lock = threading.RLock()
+
+    # 쿼리 실행 (INSERT, CREATE 등)
+    def execute(self, query, params=None):
+        with self._lock:
+            self.cursor.execute(query, params)
+            self.connection.commit()
+
+    # 여러 행을 한 번에 실행, 커밋은 호출한 쪽에서
+    def executemany(self, query, seq_params):
+        with self._lock:
+            self.cursor.executemany(query, seq_params)
+
+    # 조회 쿼리 실행 후 모든 행 반환
+    def fetchall(self, query, params=None):
+        with self._lock:
+            self.cursor.execute(query, params)
+            return self.cursor.fetchall()
+
+    def commit(self):
+        self.connection.commit()
+
+    def rollback(self):
+        self.connection.rollback()
+
+    # with helper.transaction() as tx: 블록이 정상 종료되면 커밋, 예외가 나면 롤백
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            tx = SQLiteTransaction(self.connection)
+            try:
+                yield tx
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+            finally:
+                tx.close()
+
+    # LOAD DATA LOCAL INFILE 대신: CSV 전체를 한 트랜잭션, 한 번의 executemany로 적재
+    def bulk_load_csv(self, csv_file):
+        with self._lock, open(csv_file, newline='') as file:
+            reader = csv.DictReader(file)
+            storm_column = 'storm' if 'storm' in reader.fieldnames else 'stom'
+            self.cursor.executemany(
+                'INSERT INTO mars_weather (mars_date, temp, storm) VALUES (%s, %s, %s)',
+                ((row['mars_date'], int(float(row['temp'])), int(row[storm_column])) for row in reader)
+            )
+            self.connection.commit()
+            return self.cursor.rowcount
+
+    def is_healthy(self):
+        try:
+            return self.fetchall('SELECT 1') == [(1,)]
+        except self.Error:
+            return False
+
+    def close(self):
+        self.cursor.close()
+        self.connection.close()
@@ -1,16 +1,20 @@
 import mysql.connector
+from mars_weather_summary import PooledMySQLHelper
 
 def connect_to_mysql():
     try:
-        connection = mysql.connector.connect(
+        # 적재/조회 작업과 같은 풀 헬퍼로 연결 상태를 확인
+        helper = PooledMySQLHelper(
             host='localhost',
             user='root',
             password='3535',
-            database='mars_db'
+            database='mars_db',
+            pool_size=1
         )
-        if connection.is_connected():
+        if helper.is_healthy():
             print(' MySQL 연결 성공!')
-            connection.close()
+        else:
+            print(' 연결 실패: 연결 상태 확인에 실패했습니다.')
     except mysql.connector.Error as e:
         print(f' 연결 실패: {e}')
 
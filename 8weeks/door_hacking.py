@@ -3,8 +3,9 @@ import itertools
 import string
 import multiprocessing
 import time
+import argparse
+from collections import deque
 from datetime import datetime
-import os
 
 # 압축 파일과 결과 저장 파일명
 ZIP_FILE = "emergency_storage_key.zip"
@@ -17,81 +18,252 @@ PASSWORD_LENGTH = 6
 # 시스템 CPU 코어 수 확인
 PROCESS_COUNT = multiprocessing.cpu_count()
 
-# 시작 시간과 전체 시도 횟수를 저장할 공유 변수
+# 워커 풀로 한 번에 넘기는 후보 개수 (IPC 비용을 줄이기 위해 크게 잡음)
+BATCH_SIZE = 20000
+
+# 마스크에서 사용할 문자 클래스: '?l' 처럼 쓰고, 클래스 없이 '?' 만 쓰면 CHARSET
+MASK_CLASSES = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    's': string.punctuation,
+    'a': string.ascii_letters + string.digits + string.punctuation,
+}
+
+# 단어 변형 규칙: 이름 -> (단어 -> 후보들)
+LEET_TABLE = str.maketrans({'a': '4', 'e': '3', 'i': '1', 'o': '0', 's': '5', 't': '7'})
+MUTATION_RULES = {
+    'lower': lambda w: [w.lower()],
+    'upper': lambda w: [w.upper()],
+    'capitalize': lambda w: [w.capitalize()],
+    'reverse': lambda w: [w[::-1]],
+    'leet': lambda w: [w.lower().translate(LEET_TABLE)],
+    'append_digit': lambda w: [w + d for d in string.digits],
+    'append_2digits': lambda w: [w + a + b for a in string.digits for b in string.digits],
+}
+
+# 시작 시간
 start_time = time.time()
-attempt_counter = multiprocessing.Value('i', 0)
 
-def try_passwords(start_chars, prefix, counter):
+
+# ===== 후보 생성 단계 =====
+
+def wordlist_source(path):
+    """
+    사전 파일에서 한 줄에 하나씩 후보를 읽어옴 (파일 전체를 메모리에 올리지 않음).
+    """
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            word = line.strip()
+            if word:
+                yield word
+
+
+def parse_mask(mask):
+    """
+    'mars??', '?d?d?l?l' 같은 마스크를 위치별 문자 집합 리스트로 변환함.
+    """
+    slots = []
+    i = 0
+    while i < len(mask):
+        ch = mask[i]
+        if ch == '?':
+            cls = mask[i + 1] if i + 1 < len(mask) else ''
+            if cls in MASK_CLASSES:
+                slots.append(MASK_CLASSES[cls])
+                i += 2
+                continue
+            slots.append(CHARSET)
+        else:
+            slots.append(ch)
+        i += 1
+    return slots
+
+
+def mask_source(mask):
+    """
+    마스크에 해당하는 모든 후보를 순서대로 생성함.
+    """
+    for chars in itertools.product(*parse_mask(mask)):
+        yield ''.join(chars)
+
+
+def mutation_source(words, rules=None):
+    """
+    단어 목록(또는 생성기)에 변형 규칙을 적용한 후보를 생성함.
+    """
+    rules = rules or list(MUTATION_RULES)
+    for word in words:
+        yield word
+        for name in rules:
+            yield from MUTATION_RULES[name](word)
+
+
+def brute_force_source(charset=CHARSET, length=PASSWORD_LENGTH):
+    """
+    주어진 길이의 모든 조합을 생성하는 전체 탐색 소스.
+    """
+    for chars in itertools.product(charset, repeat=length):
+        yield ''.join(chars)
+
+
+def candidate_pipeline(phases, batch_size=BATCH_SIZE):
     """
-    주어진 시작 문자들로 가능한 암호를 조합해 압축 해제를 시도함.
+    (단계 이름, 소스, 전체탐색 여부) 목록을 우선순위대로 이어 붙여
+    (단계 이름, 후보 리스트) 배치를 지연 생성함.
+    앞 단계에서 나온 후보는 뒤 단계에서 다시 시도하지 않음.
+    전체 탐색 단계의 후보는 너무 많으므로 중복 확인만 하고 기록하지는 않음.
+    """
+    seen = set()
+    for name, source, exhaustive in phases:
+        batch = []
+        for candidate in source:
+            if candidate in seen:
+                continue
+            if not exhaustive:
+                seen.add(candidate)
+            batch.append(candidate)
+            if len(batch) >= batch_size:
+                yield name, batch
+                batch = []
+        if batch:
+            yield name, batch
+
+
+def build_phases(masks=None, wordlist=None, rules=None, exhaustive=True):
+    """
+    기본 탐색 전략: 사전(+변형) -> 마스크 -> 전체 탐색 순서로 단계를 구성함.
+    """
+    phases = []
+    if wordlist:
+        phases.append((f"wordlist:{wordlist}", wordlist_source(wordlist), False))
+        if rules is not None:
+            phases.append(("mutation", mutation_source(wordlist_source(wordlist), rules), False))
+    for mask in masks if masks is not None else ["mars??"]:
+        phases.append((f"mask:{mask}", mask_source(mask), False))
+    if exhaustive:
+        phases.append(("brute-force", brute_force_source(), True))
+    return phases
+
+
+# ===== 검증 단계 (워커 프로세스) =====
+
+_worker_zip = None
+_worker_info = None
+
+
+def check_password(zf, info, password):
+    """
+    압축을 풀지 않고 가장 작은 파일 하나를 읽어 CRC까지 확인함.
     """
     try:
-        with zipfile.ZipFile(ZIP_FILE) as zf:
-            for start_char in start_chars:
-                for pwd_tuple in itertools.product(CHARSET, repeat=PASSWORD_LENGTH - len(prefix) - 1):
-                    password = prefix + start_char + ''.join(pwd_tuple)
+        with zf.open(info, pwd=password.encode()) as f:
+            while f.read(1 << 16):
+                pass
+        return True
+    except Exception:
+        return False
+
 
-                    with counter.get_lock():
-                        counter.value += 1
-                        count = counter.value
+def _init_worker(zip_path):
+    """
+    워커마다 압축 파일을 한 번만 열어 둠.
+    """
+    global _worker_zip, _worker_info
+    _worker_zip = zipfile.ZipFile(zip_path)
+    _worker_info = min(_worker_zip.infolist(), key=lambda i: i.file_size)
 
-                    try:
-                        zf.extractall(pwd=password.encode())
-                        duration = time.time() - start_time
 
-                        print(f"\n[+] 암호 해제 성공!")
-                        print(f"[+] 암호: {password}")
-                        print(f"[+] 시작 시간: {datetime.fromtimestamp(start_time).strftime('%Y-%m-%d %H:%M:%S')}")
-                        print(f"[+] 시도 횟수: {count}")
-                        print(f"[+] 소요 시간: {duration:.2f}초")
+def _verify_batch(batch):
+    """
+    배치 단위로 검증하고 (찾은 암호 또는 None, 시도 횟수)를 반환함.
+    """
+    for i, password in enumerate(batch):
+        if check_password(_worker_zip, _worker_info, password):
+            return password, i + 1
+    return None, len(batch)
 
-                        with open(OUTPUT_FILE, "w") as f:
-                            f.write(password)
-                            f.flush()
-                            time.sleep(0.1)  # 디스크 기록 시간 확보
 
-                        os._exit(0)
-                    except:
-                        if count % 1000 == 0:
-                            print(f"[{prefix+start_char}] {count}회 시도 중... 경과 시간: {time.time() - start_time:.2f}초")
+def search(phases, zip_path=ZIP_FILE, processes=PROCESS_COUNT, batch_size=BATCH_SIZE):
+    """
+    후보 배치를 워커 풀에 나눠 검증함.
+    암호를 찾으면 with 블록을 벗어나면서 풀이 종료(terminate)되어 남은 배치는 버려짐.
+    """
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(zip_path,)) as pool:
+        return search_with_pool(pool, phases, processes, batch_size)
 
-    except Exception as e:
-        print(f"[!] 오류 발생: {e}")
 
-def run_crack(prefix):
+def search_with_pool(pool, phases, processes=PROCESS_COUNT, batch_size=BATCH_SIZE):
     """
-    prefix를 기반으로 프로세스를 분할 실행
+    이미 만들어 둔 워커 풀로 탐색함 (벤치마크처럼 풀 시작 시간을 빼고 잴 때 사용).
+    생성기가 한꺼번에 소비되지 않도록 동시에 처리 중인 배치 수를 제한함.
     """
-    print(f"[*] 시작 단계: prefix='{prefix}'")
-    start_chars = CHARSET[:PROCESS_COUNT]  # 코어 수만큼 시작 문자 분배
-    processes = []
+    count = 0
+    current_phase = None
+    pending = deque()
+    window = processes * 2
 
-    for i in range(PROCESS_COUNT):
-        chs = CHARSET[i::PROCESS_COUNT]  # 문자 집합을 분산 처리
-        p = multiprocessing.Process(target=try_passwords, args=(chs, prefix, attempt_counter))
-        p.start()
-        processes.append(p)
+    batches = candidate_pipeline(phases, batch_size)
+    exhausted = False
+    while True:
+        while not exhausted and len(pending) < window:
+            try:
+                name, batch = next(batches)
+            except StopIteration:
+                exhausted = True
+                break
+            if name != current_phase:
+                current_phase = name
+                print(f"[*] 시작 단계: {name}")
+            pending.append(pool.apply_async(_verify_batch, (batch,)))
 
-    for p in processes:
-        p.join()
+        if not pending:
+            return None, count
 
-def unlock_zip():
+        password, tried = pending.popleft().get()
+        count += tried
+        if password is not None:
+            return password, count
+        print(f"[{current_phase}] {count}회 시도 중... 경과 시간: {time.time() - start_time:.2f}초")
+
+
+def unlock_zip(masks=None, wordlist=None, rules=None, batch_size=BATCH_SIZE):
     """
     'mars'로 시작하는 암호 먼저 시도하고, 실패 시 전체 6자리 암호 시도
     """
     global start_time
     print(f"[*] 멀티코어 암호 해독 시작 (CPU 코어 수: {PROCESS_COUNT})")
 
-    # 1단계: marsxx 형식 우선 시도
     start_time = time.time()
-    run_crack("mars")
+    phases = build_phases(masks=masks, wordlist=wordlist, rules=rules)
+    password, count = search(phases, batch_size=batch_size)
+
+    if password is None:
+        print("[!] 암호를 찾지 못했습니다.")
+        return None
+
+    duration = time.time() - start_time
+    with zipfile.ZipFile(ZIP_FILE) as zf:
+        zf.extractall(pwd=password.encode())
+
+    print(f"\n[+] 암호 해제 성공!")
+    print(f"[+] 암호: {password}")
+    print(f"[+] 시작 시간: {datetime.fromtimestamp(start_time).strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"[+] 시도 횟수: {count}")
+    print(f"[+] 소요 시간: {duration:.2f}초")
+
+    with open(OUTPUT_FILE, "w") as f:
+        f.write(password)
+    return password
 
-    # password.txt가 생성되지 않았으면 전체 탐색 시도
-    if not os.path.exists(OUTPUT_FILE):
-        print("[*] marsxx 실패, 전체 탐색 시도 중...")
-        attempt_counter.value = 0  # 카운터 초기화
-        start_time = time.time()
-        run_crack("")
 
 if __name__ == "__main__":
-    unlock_zip()
+    parser = argparse.ArgumentParser(description="ZIP 암호 해독")
+    parser.add_argument("--wordlist", help="우선 시도할 사전 파일")
+    parser.add_argument("--rules", nargs="*", choices=list(MUTATION_RULES),
+                        help="사전 단어에 적용할 변형 규칙 (인자 없이 쓰면 전체 규칙)")
+    parser.add_argument("--mask", action="append", dest="masks",
+                        help="우선 시도할 마스크 (예: mars??, ?d?d?l?l), 여러 번 지정 가능")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    unlock_zip(masks=args.masks, wordlist=args.wordlist, rules=args.rules, batch_size=args.batch_size)
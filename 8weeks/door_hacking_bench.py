@@ -0,0 +1,177 @@
+import argparse
+import contextlib
+import io
+import itertools
+import multiprocessing
+import os
+import random
+import string
+import struct
+import tempfile
+import time
+import zlib
+
+import door_hacking
+
+# ===== ZipCrypto 압축 파일 생성 (zipfile 모듈은 암호화 쓰기를 지원하지 않음) =====
+
+CRC_TABLE = []
+for n in range(256):
+    c = n
+    for _ in range(8):
+        c = (c >> 1) ^ 0xEDB88320 if c & 1 else c >> 1
+    CRC_TABLE.append(c)
+
+
+class ZipCrypto:
+    """
+    PKWARE 전통 암호화(ZipCrypto) 키 스트림.
+    """
+
+    def __init__(self, password):
+        self.keys = [0x12345678, 0x23456789, 0x34567890]
+        for b in password:
+            self._update(b)
+
+    def _update(self, b):
+        k0, k1, k2 = self.keys
+        k0 = CRC_TABLE[(k0 ^ b) & 0xFF] ^ (k0 >> 8)
+        k1 = (k1 + (k0 & 0xFF)) & 0xFFFFFFFF
+        k1 = (k1 * 134775813 + 1) & 0xFFFFFFFF
+        k2 = CRC_TABLE[(k2 ^ (k1 >> 24)) & 0xFF] ^ (k2 >> 8)
+        self.keys = [k0, k1, k2]
+
+    def encrypt(self, data):
+        out = bytearray()
+        for b in data:
+            t = (self.keys[2] | 2) & 0xFFFF
+            out.append(b ^ (((t * (t ^ 1)) >> 8) & 0xFF))
+            self._update(b)
+        return bytes(out)
+
+
+def build_encrypted_zip(path, password, filename="password.txt", content=b"emergency key"):
+    """
+    내용을 deflate로 압축하고 ZipCrypto로 암호화한 단일 파일 압축본을 만듦.
+    """
+    crc = zlib.crc32(content) & 0xFFFFFFFF
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    compressed = compressor.compress(content) + compressor.flush()
+    header = bytes(random.randrange(256) for _ in range(11)) + bytes([crc >> 24])
+    payload = ZipCrypto(password.encode()).encrypt(header + compressed)
+
+    name = filename.encode()
+    flags, method, mtime, mdate = 0x1, 8, 0, 0x21
+    local = struct.pack("<4s5H3L2H", b"PK\x03\x04", 20, flags, method, mtime, mdate,
+                        crc, len(payload), len(content), len(name), 0) + name
+    central = struct.pack("<4s6H3L5H2L", b"PK\x01\x02", 20, 20, flags, method, mtime, mdate,
+                          crc, len(payload), len(content), len(name), 0, 0, 0, 0, 0x20, 0) + name
+    end = struct.pack("<4s4H2LH", b"PK\x05\x06", 0, 0, 1, 1,
+                      len(central), len(local) + len(payload), 0)
+    with open(path, "wb") as f:
+        f.write(local + payload + central + end)
+
+
+# ===== 측정 =====
+
+def wrong_candidates(count, length):
+    """
+    정답과 겹치지 않는 (대문자만 쓰는) 후보 목록.
+    """
+    source = door_hacking.brute_force_source(string.ascii_uppercase, length)
+    return list(itertools.islice(source, count))
+
+
+def bench_verify_rate(zip_path, count, length):
+    """
+    단일 코어에서 검증만 수행했을 때의 초당 시도 횟수.
+    """
+    door_hacking._init_worker(zip_path)
+    candidates = wrong_candidates(count, length)
+    t0 = time.perf_counter()
+    password, tried = door_hacking._verify_batch(candidates)
+    elapsed = time.perf_counter() - t0
+    return tried / elapsed
+
+
+def bench_generation_rate(count, batch_size):
+    """
+    검증 없이 후보 생성(중복 제거, 배치 포함)만 수행했을 때의 초당 후보 수.
+    """
+    phases = [("brute-force", door_hacking.brute_force_source(), True)]
+    produced = 0
+    t0 = time.perf_counter()
+    for _, batch in door_hacking.candidate_pipeline(phases, batch_size):
+        produced += len(batch)
+        if produced >= count:
+            break
+    return produced / (time.perf_counter() - t0)
+
+
+def bench_search(zip_path, count, processes, batch_size):
+    """
+    정답이 없는 후보 count개를 워커 processes개로 끝까지 탐색한 초당 시도 횟수.
+    풀 시작(프로세스 생성, 압축 파일 열기)은 측정에서 제외함.
+    """
+    phases = [("bench", iter(wrong_candidates(count, door_hacking.PASSWORD_LENGTH)), False)]
+    with multiprocessing.Pool(processes, initializer=door_hacking._init_worker,
+                              initargs=(zip_path,)) as pool:
+        # 모든 워커가 떠서 초기화를 마칠 때까지 빈 배치로 예열
+        pool.map(door_hacking._verify_batch, [[]] * processes, chunksize=1)
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, tried = door_hacking.search_with_pool(pool, phases, processes, batch_size)
+        return tried / (time.perf_counter() - t0)
+
+
+def scaling_batch_size(count, max_workers, batch_size, batches_per_worker=8):
+    """
+    가장 많은 워커 수에서도 워커마다 배치가 여러 개 돌아가도록 배치 크기를 줄임.
+    배치 수가 워커 수보다 적으면 남는 워커가 놀아서 확장성이 배치 수에 묶임.
+    """
+    return max(1, min(batch_size, count // (max_workers * batches_per_worker)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="door_hacking 처리량 벤치마크")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[4, 6, 8])
+    parser.add_argument("--candidates", type=int, default=50000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, door_hacking.PROCESS_COUNT}))
+    parser.add_argument("--batch-size", type=int, default=door_hacking.BATCH_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("[*] 검증 속도 (단일 코어)")
+        zip_paths = {}
+        for length in args.lengths:
+            password = "".join(random.choice(door_hacking.CHARSET) for _ in range(length))
+            path = os.path.join(tmp, f"bench_{length}.zip")
+            build_encrypted_zip(path, password)
+            zip_paths[length] = path
+
+            # 만든 압축 파일이 실제 정답으로 풀리는지 먼저 확인
+            door_hacking._init_worker(path)
+            assert door_hacking._verify_batch([password]) == (password, 1)
+
+            rate = bench_verify_rate(path, args.candidates, length)
+            print(f"  길이 {length}: {rate:,.0f} 회/초")
+
+        gen_rate = bench_generation_rate(args.candidates, args.batch_size)
+        verify_rate = bench_verify_rate(zip_paths[args.lengths[0]], args.candidates, args.lengths[0])
+        overhead = (1 / gen_rate) / (1 / gen_rate + 1 / verify_rate) * 100
+        print("[*] 생성 대비 검증 비용")
+        print(f"  생성: {gen_rate:,.0f} 개/초, 검증: {verify_rate:,.0f} 회/초, 생성 비중: {overhead:.1f}%")
+
+        scale_batch = scaling_batch_size(args.candidates, max(args.workers), args.batch_size)
+        print(f"[*] 워커 수에 따른 확장성 (배치 {scale_batch}개씩, "
+              f"{-(-args.candidates // scale_batch)}개 배치)")
+        base = None
+        for processes in args.workers:
+            rate = bench_search(zip_paths[args.lengths[0]], args.candidates, processes, scale_batch)
+            base = base or rate
+            print(f"  워커 {processes}개: {rate:,.0f} 회/초 (코어당 {rate / processes:,.0f}, x{rate / base:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,336 @@
+import argparse
+import csv
+import glob
+import hashlib
+import multiprocessing
+import os
+import pickle
+import re
+import string
+import sys
+import time
+from collections import Counter
+
+# 스트리밍 복호화 시 한 번에 읽어 들일 문자 수
+CHUNK_SIZE = 1 << 20
+
+# 전체 영어 단어 목록 파일 (한 줄에 한 단어, 없으면 내장 사전 사용)
+WORDLIST = 'words.txt'
+# 컴파일된 단어 사전을 저장해 둘 캐시 폴더
+LEXICON_CACHE_DIR = '.lexicon_cache'
+# 인식된 단어 비율이 이 값 이상이면 더 보지 않고 바로 암호로 판단
+MIN_WORD_RATIO = 0.5
+# 단어 수가 이보다 적은 사전(내장 사전)은 비율이 낮게 나오므로 한 단어라도 맞으면 암호로 판단
+MIN_LEXICON_SIZE = 1000
+# 점수 계산에 사용할 최대 단어 수 (큰 텍스트는 앞부분만 표본으로 사용)
+SCORE_SAMPLE_WORDS = 2000
+# 점수 계산용으로 복호화할 앞부분 문자 수
+SCORE_SAMPLE_CHARS = SCORE_SAMPLE_WORDS * 16
+
+# 시프트 값(0~25)별 복호화 변환표를 미리 만들어 둠, 알파벳이 26글자이므로
+# str.translate는 C 수준에서 한 번에 치환하므로 문자 단위 문자열 이어 붙이기가 필요 없음
+DECODE_TABLES = [
+    str.maketrans(
+        string.ascii_uppercase + string.ascii_lowercase,
+        string.ascii_uppercase[-shift:] + string.ascii_uppercase[:-shift]
+        + string.ascii_lowercase[-shift:] + string.ascii_lowercase[:-shift],
+    )
+    for shift in range(26)
+]
+
+# 지정한 시프트 값으로 텍스트를 복호화하는 함수
+def decode_with_shift(target_text, shift):
+    return target_text.translate(DECODE_TABLES[shift % 26])
+
 # Caesar Cipher를 이용해 암호화된 텍스트를 모든 가능한 경우로 복호화하는 함수
-def caesar_cipher_decode(target_text):
+def caesar_cipher_decode(target_text, verbose=True):
     decoded_results = []  # 복호화된 결과를 저장할 리스트 생성
 
-    # 시프트 값(0~25)만큼 반복하며 모든 가능한 복호화 시도, 알파벳이 26글자이므로
+    # 시프트 값(0~25)만큼 반복하며 모든 가능한 복호화 시도
     for shift in range(26):
-        decoded_text = ''  # 현재 시프트 값에 대한 복호화 결과를 저장할 문자열
-        
-        # 입력 텍스트의 각 문자별로 처리
-        for char in target_text:
-            if char.isalpha():  # 알파벳인 경우에만 처리
-                start = ord('A') if char.isupper() else ord('a')  # 대소문자 구분하여 시작점 설정
-                # 복호화 공식 적용
-                decoded_char = chr(start + (ord(char) - start - shift) % 26)
-                decoded_text += decoded_char  # 복호화된 문자 추가
-            else:
-                decoded_text += char  # 알파벳 외 문자는 그대로 추가
-
+        decoded_text = decode_with_shift(target_text, shift)
         decoded_results.append((shift, decoded_text))  # 결과 리스트에 추가
-        print(f'Shift={shift}: {decoded_text}')  # 각 결과 출력
+        if verbose:
+            print(f'Shift={shift}: {decoded_text}')  # 각 결과 출력
 
     return decoded_results  # 모든 복호화 결과 반환
 
+# 큰 파일을 청크 단위로 읽어 복호화 결과를 바로 출력 파일에 쓰는 함수
+def decode_stream(input_path, output_path, shift, chunk_size=CHUNK_SIZE):
+    table = DECODE_TABLES[shift % 26]
+    with open(input_path, 'r') as src, open(output_path, 'w') as dst:
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            dst.write(chunk.translate(table))
+
+# 영어 알파벳 a~z 출현 빈도 (%)
+ENGLISH_FREQ = [
+    8.17, 1.49, 2.78, 4.25, 12.70, 2.23, 2.02, 6.09, 6.97, 0.15, 0.77, 4.03, 2.41,
+    6.75, 7.51, 1.93, 0.10, 5.99, 6.33, 9.06, 2.76, 0.98, 2.36, 0.15, 1.97, 0.07,
+]
+
+# 암호문 전체를 한 번만 훑어 a~z 출현 횟수를 세는 함수
+def letter_histogram(target_text, histogram=None):
+    counts = Counter(target_text.lower())
+    histogram = histogram or [0] * 26
+    for i, letter in enumerate(string.ascii_lowercase):
+        histogram[i] += counts[letter]
+    return histogram
+
+# 큰 파일을 청크 단위로 읽으며 히스토그램을 누적하는 함수
+def letter_histogram_stream(input_path, chunk_size=CHUNK_SIZE):
+    histogram = [0] * 26
+    with open(input_path, 'r') as src:
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            letter_histogram(chunk, histogram)
+    return histogram
+
+# 히스토그램을 26가지로 회전시켜 카이제곱 값이 작은(영어에 가까운) 시프트 순으로 정렬하는 함수
+def rank_shifts(histogram):
+    total = sum(histogram)
+    if total == 0:
+        return list(range(26))
+    scores = []
+    for shift in range(26):
+        chi_squared = 0.0
+        for i, freq in enumerate(ENGLISH_FREQ):
+            expected = total * freq / 100
+            observed = histogram[(i + shift) % 26]  # 복호화 후 i번째 글자는 암호문의 (i+shift)번째 글자
+            chi_squared += (observed - expected) ** 2 / expected
+        scores.append((chi_squared, shift))
+    return [shift for _, shift in sorted(scores)]
+
+# 빈도 분석 순위대로 필요한 시프트만 복호화해 돌려주는 함수 (지연 생성)
+def ranked_decode(target_text, histogram=None):
+    for shift in rank_shifts(histogram or letter_histogram(target_text)):
+        yield shift, decode_with_shift(target_text, shift)
+
 # 예시로 사용할 간단한 영어 단어 사전을 로드하는 함수
 def load_dictionary():
     # 유의미한 단어 목록
     return {'emergency', 'storage', 'key', 'mars', 'caesar', 'password', 'open', 'door'}
 
-# 복호화된 결과 중에서 실제 영어 단어를 포함한 암호를 찾아내는 함수
-def identify_password(decoded_results, dictionary):
+# 단어 목록 파일의 내용 해시를 구하는 함수 (캐시 키로 사용)
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+# 큰 영어 단어 목록을 frozenset으로 만들고, 해시별 캐시 파일로 저장해 재사용하는 함수
+def load_lexicon(wordlist_path=WORDLIST, cache_dir=LEXICON_CACHE_DIR):
+    cache_path = os.path.join(cache_dir, f'{file_hash(wordlist_path)}.pickle')
+
+    # 같은 단어 목록으로 이미 만든 캐시가 있으면 그대로 로드
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as file:
+            return pickle.load(file)
+
+    with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as file:
+        lexicon = frozenset(line.strip().lower() for line in file if line.strip())
+
+    # 다른 프로세스와 겹쳐도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as file:
+        pickle.dump(lexicon, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+    return lexicon
+
+# 텍스트의 단어 중 사전에 있는 단어의 비율을 계산하는 함수
+def word_score(text, dictionary, sample_words=SCORE_SAMPLE_WORDS):
+    words = re.findall(r'[a-z]+', text[:SCORE_SAMPLE_CHARS].lower())[:sample_words]
+    if not words:
+        return 0.0
+    return sum(word in dictionary for word in words) / len(words)
+
+# 복호화된 결과 중에서 실제 영어 단어 비율이 가장 높은 암호를 찾아내는 함수
+def identify_password(decoded_results, dictionary, min_ratio=None, verbose=True):
+    if min_ratio is None:
+        min_ratio = MIN_WORD_RATIO if len(dictionary) >= MIN_LEXICON_SIZE else 0.0
+    best_score, best = 0.0, (None, None)
     # 각 복호화된 결과를 검사
     for shift, text in decoded_results:
-        words = text.lower().split()  # 소문자로 변환 후 단어로 분리
-        # 사전의 단어가 포함된 결과를 발견하면 성공 메시지 출력 후 반환
-        if any(word in dictionary for word in words):
-            print(f'해독 성공: Shift {shift} -> {text}')
-            return shift, text
-    # 사전에 있는 단어가 없으면 None 반환
-    return None, None
+        score = word_score(text, dictionary)
+        if score > best_score:
+            best_score, best = score, (shift, text)
+        # 충분히 영어다운 결과를 발견하면 나머지는 보지 않음
+        if score > 0 and score >= min_ratio:
+            break
 
-# 실제 프로그램 실행부 (메인 로직)
-try:
-    # 암호화된 텍스트가 저장된 파일 읽기 시도
-    with open('password.txt', 'r') as file:
-        encrypted_text = file.read().strip()  # 파일 내용을 읽고 공백 제거
-except FileNotFoundError:
-    # 파일이 존재하지 않을 때 오류 메시지 출력
-    print('Error: password.txt 파일을 찾을 수 없습니다.')
-    exit()  # 프로그램 종료
-except Exception as e:
-    # 그 외의 오류 발생 시 메시지 출력 후 종료
-    print(f'파일 읽기 중 오류가 발생했습니다: {e}')
-    exit()
-
-# 단어 사전 로드
-dictionary = load_dictionary()
-
-# Caesar Cipher를 이용한 모든 가능한 복호화 결과 생성
-decoded_results = caesar_cipher_decode(encrypted_text)
-
-# 생성된 결과 중 실제 암호 찾기 시도
-shift, final_password = identify_password(decoded_results, dictionary)
-
-# 성공적으로 암호를 찾았을 경우 결과를 파일에 저장
-if shift is not None:
+    # 사전에 있는 단어가 하나도 없으면 None 반환
+    if verbose and best[0] is not None:
+        preview = best[1] if len(best[1]) <= 80 else best[1][:80] + '...'
+        print(f'해독 성공: Shift {best[0]} -> {preview} (인식 단어 비율 {best_score:.0%})')
+    return best
+
+# 설정에 따라 사용할 단어 사전을 고르는 함수
+def default_dictionary():
+    return load_lexicon() if os.path.exists(WORDLIST) else load_dictionary()
+
+# 암호화된 텍스트 파일을 읽는 함수 (오류는 호출한 쪽에서 처리)
+def read_ciphertext(path):
+    with open(path, 'r') as file:
+        return file.read().strip()  # 파일 내용을 읽고 공백 제거
+
+# 하나의 암호문을 해독해 (시프트, 복호문)을 반환하는 함수
+def crack_text(encrypted_text, dictionary=None, verbose=False):
+    dictionary = dictionary if dictionary is not None else default_dictionary()
+    # 빈도 분석은 전체 텍스트로, 후보 확인은 앞부분만 복호화해서 (26개를 모두 만들지 않음)
+    histogram = letter_histogram(encrypted_text)
+    decoded_results = ranked_decode(encrypted_text[:SCORE_SAMPLE_CHARS], histogram)
+    # 생성된 결과를 사전으로 확인하며 실제 암호 찾기 시도
+    shift, _ = identify_password(decoded_results, dictionary, verbose=verbose)
+    if shift is None:
+        return None, None
+    # 찾은 시프트 하나만 전체 복호화
+    return shift, decode_with_shift(encrypted_text, shift)
+
+# 암호문 파일 하나를 해독하고 처리 시간과 처리량을 함께 반환하는 함수
+def crack_file(path, dictionary=None):
+    start = time.perf_counter()
+    result = {'file': path, 'shift': None, 'text': '', 'bytes': 0, 'seconds': 0.0, 'error': ''}
     try:
-        with open('result.txt', 'w') as file:
+        encrypted_text = read_ciphertext(path)
+        result['bytes'] = len(encrypted_text.encode())
+        result['shift'], result['text'] = crack_text(encrypted_text, dictionary)
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+# 큰 암호문 파일을 메모리에 전부 올리지 않고 해독해 output_path에 쓰는 함수
+def crack_stream(input_path, output_path, dictionary=None, chunk_size=CHUNK_SIZE, verbose=False):
+    dictionary = dictionary if dictionary is not None else default_dictionary()
+    # 1) 파일을 청크 단위로 한 번 훑어 글자 빈도 계산
+    histogram = letter_histogram_stream(input_path, chunk_size)
+    # 2) 앞부분 표본만 읽어 빈도 순위대로 시프트 확인
+    with open(input_path, 'r') as src:
+        sample = src.read(SCORE_SAMPLE_CHARS)
+    shift, _ = identify_password(ranked_decode(sample, histogram), dictionary, verbose=verbose)
+    if shift is None:
+        return None
+    # 3) 찾은 시프트로 청크 단위 복호화
+    decode_stream(input_path, output_path, shift, chunk_size)
+    return shift
+
+# ===== 일괄 처리 (프로세스 풀) =====
+
+_worker_dictionary = None
+
+# 워커 프로세스마다 사전을 한 번만 로드
+def _init_worker():
+    global _worker_dictionary
+    _worker_dictionary = default_dictionary()
+
+def _crack_file_worker(path):
+    return crack_file(path, _worker_dictionary)
+
+# 폴더 안의 암호문들을 프로세스 풀로 해독하고 결과를 하나의 CSV 파일에 바로바로 기록하는 함수
+def crack_directory(input_dir, output_path, pattern='*.txt', processes=None):
+    paths = sorted(glob.glob(os.path.join(input_dir, pattern)))
+    total_bytes, cracked = 0, 0
+    start = time.perf_counter()
+
+    # 사전 캐시를 미리 만들어 워커들이 동시에 만들지 않게 함
+    default_dictionary()
+
+    with open(output_path, 'w', newline='', encoding='utf-8') as out, \
+            multiprocessing.Pool(processes, initializer=_init_worker) as pool:
+        writer = csv.writer(out)
+        writer.writerow(['파일', '시프트', '크기(바이트)', '소요시간(초)', '처리량(MB/s)', '복호문', '오류'])
+        for result in pool.imap_unordered(_crack_file_worker, paths, chunksize=4):
+            throughput = result['bytes'] / result['seconds'] / 1e6 if result['seconds'] else 0.0
+            writer.writerow([
+                os.path.basename(result['file']), result['shift'], result['bytes'],
+                f"{result['seconds']:.4f}", f'{throughput:.2f}', result['text'], result['error'],
+            ])
+            out.flush()
+            total_bytes += result['bytes']
+            cracked += result['shift'] is not None
+
+    elapsed = time.perf_counter() - start
+    print(f'{len(paths)}개 파일 중 {cracked}개 해독, {elapsed:.2f}초 '
+          f'({len(paths) / elapsed if elapsed else 0:.1f} 파일/초, '
+          f'{total_bytes / elapsed / 1e6 if elapsed else 0:.2f} MB/s)')
+    print(f'결과가 {output_path}에 저장되었습니다.')
+    return cracked
+
+# 기존 방식: password.txt 하나를 해독해 result.txt에 저장 (stream=True면 청크 단위로 처리)
+def crack_single(input_path='password.txt', output_path='result.txt', stream=False):
+    if stream:
+        return _crack_single_stream(input_path, output_path)
+    try:
+        # 암호화된 텍스트가 저장된 파일 읽기 시도
+        encrypted_text = read_ciphertext(input_path)
+    except FileNotFoundError:
+        # 파일이 존재하지 않을 때 오류 메시지 출력
+        print(f'Error: {input_path} 파일을 찾을 수 없습니다.')
+        return 1
+    except Exception as e:
+        # 그 외의 오류 발생 시 메시지 출력
+        print(f'파일 읽기 중 오류가 발생했습니다: {e}')
+        return 1
+
+    shift, final_password = crack_text(encrypted_text, verbose=True)
+
+    # 성공적으로 암호를 찾았을 경우 결과를 파일에 저장
+    if shift is None:
+        # 암호를 찾지 못한 경우 메시지 출력
+        print('적합한 암호를 찾지 못했습니다.')
+        return 1
+    try:
+        with open(output_path, 'w') as file:
             file.write(final_password)
-        print(f'최종 암호가 result.txt에 저장되었습니다. (Shift={shift})')
+        print(f'최종 암호가 {output_path}에 저장되었습니다. (Shift={shift})')
     except Exception as e:
         print(f'파일 저장 중 오류가 발생했습니다: {e}')
-else:
-    # 암호를 찾지 못한 경우 메시지 출력
-    print('적합한 암호를 찾지 못했습니다.')
\ No newline at end of file
+        return 1
+    return 0
+
+def _crack_single_stream(input_path, output_path):
+    start = time.perf_counter()
+    try:
+        shift = crack_stream(input_path, output_path, verbose=True)
+    except FileNotFoundError:
+        print(f'Error: {input_path} 파일을 찾을 수 없습니다.')
+        return 1
+    except Exception as e:
+        print(f'스트리밍 해독 중 오류가 발생했습니다: {e}')
+        return 1
+
+    if shift is None:
+        print('적합한 암호를 찾지 못했습니다.')
+        return 1
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(input_path)
+    print(f'복호문이 {output_path}에 저장되었습니다. (Shift={shift}, '
+          f'{elapsed:.2f}초, {size / elapsed / 1e6 if elapsed else 0:.1f} MB/s)')
+    return 0
+
+# 실제 프로그램 실행부 (메인 로직)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Caesar 암호 해독')
+    parser.add_argument('--batch', metavar='DIR', help='폴더 안의 암호문 파일을 일괄 해독')
+    parser.add_argument('--pattern', default='*.txt', help='일괄 처리할 파일 패턴')
+    parser.add_argument('--output', default='results.csv', help='일괄 처리 결과 파일')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--input', default='password.txt', help='해독할 암호문 파일')
+    parser.add_argument('--result', default='result.txt', help='복호문을 저장할 파일')
+    parser.add_argument('--stream', action='store_true',
+                        help='큰 파일을 메모리에 올리지 않고 청크 단위로 해독')
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        crack_directory(args.batch, args.output, args.pattern, args.workers)
+        return 0
+    return crack_single(args.input, args.result, stream=args.stream)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,20 +1,177 @@
 
+import argparse
+import queue
+import selectors
 import socket
 import threading
-from typing import Dict, Tuple
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+try:
+    import resource  # 파일 디스크립터 한도 조정 (유닉스 전용)
+except ImportError:
+    resource = None
+
+
+# 클라이언트 한 명당 보내지 못하고 쌓아 둘 수 있는 최대 메시지 수
+MAX_PENDING = 1024
+
+# sendmsg 한 번에 넘길 최대 버퍼 수 (리눅스 IOV_MAX)
+MAX_IOV = 1024
+
+# sendmsg가 없는 플랫폼(Windows)에서는 버퍼를 하나씩 send
+HAS_SENDMSG = hasattr(socket.socket, 'sendmsg')
+
+# 송신 큐가 가득 찼을 때의 처리: 'drop'은 새 메시지를 버림, 'disconnect'는 연결을 끊음
+OVERFLOW_POLICIES = ('drop', 'disconnect')
+
+WHISPER_USAGE = '사용법: /귓속말 대상사용자 메시지  또는  /w 대상사용자 메시지'
+
+
+def is_whisper(msg: str) -> bool:
+    """귓속말 명령인지 확인."""
+    return msg.startswith('/귓속말 ') or msg.startswith('/w ')
+
+
+def parse_whisper(raw: str) -> Tuple[str, str, str]:
+    """귓속말 명령을 (대상 사용자, 메시지, 오류 안내)로 분리. 오류가 없으면 오류 안내는 ''."""
+    # 포맷 통일: '/귓속말 ' 또는 '/w ' 제거
+    if raw.startswith('/귓속말 '):
+        content = raw[len('/귓속말 '):].strip()
+    else:
+        content = raw[len('/w '):].strip()
+
+    # 첫 토큰은 대상 사용자, 나머지는 메시지
+    parts = content.split(' ', 1)
+    if not content or len(parts) < 2:
+        return '', '', WHISPER_USAGE
+
+    target_user, message = parts[0].strip(), parts[1].strip()
+    if not target_user or not message:
+        return '', '', '대상 사용자와 메시지를 정확히 입력해 주세요.'
+    return target_user, message, ''
+
+
+def encode_line(line: str) -> bytes:
+    """전송할 한 줄을 바이트로 변환 (브로드캐스트는 받는 사람 수와 관계없이 한 번만 호출)."""
+    return (line + '\n').encode('utf-8')
+
+
+def send_buffers(sock: socket.socket, buffers: Deque[memoryview]) -> int:
+    """쌓인 버퍼들을 sendmsg 한 번으로 모아 보내고(scatter-gather) 보낸 바이트 수를 반환."""
+    if HAS_SENDMSG:
+        return sock.sendmsg(list(islice(buffers, MAX_IOV)))
+    return sock.send(buffers[0])
+
+
+def consume(buffers: Deque[memoryview], sent: int) -> None:
+    """보낸 바이트 수만큼 버퍼 앞쪽을 제거. 일부만 보낸 버퍼는 남은 부분만 남김 (복사 없음)."""
+    while sent:
+        head = buffers[0]
+        if sent < len(head):
+            buffers[0] = head[sent:]
+            return
+        buffers.popleft()
+        sent -= len(head)
+
+
+def validate_username(candidate: str) -> str:
+    """사용자명 형식 검사. 문제가 있으면 다시 입력하라는 안내, 없으면 ''."""
+    if not candidate:
+        return '공백은 이름으로 사용할 수 없습니다. 다시 입력해 주세요: '
+    if ' ' in candidate:
+        return '이름에는 공백을 포함할 수 없습니다. 다시 입력해 주세요: '
+    return ''
+
+
+class _ClientSession:
+    """스레드 서버에서 접속 사용자 한 명의 송신 큐와 그 큐를 비우는 전용 송신 스레드.
+
+    다른 스레드는 큐에 넣기만 하므로 느린 수신자가 있어도 보내는 쪽은 멈추지 않는다.
+    """
+
+    def __init__(self, sock: socket.socket, addr: Tuple[str, int], max_pending: int = MAX_PENDING) -> None:
+        self.sock = sock
+        self.addr = addr
+        # None은 송신 스레드 종료 신호
+        self.outbox: 'queue.Queue[Optional[memoryview]]' = queue.Queue(maxsize=max_pending)
+        self.writer = threading.Thread(target=self._drain, daemon=True)
+        self.writer.start()
+
+    def enqueue(self, data: memoryview) -> bool:
+        """인코딩된 한 줄을 송신 큐에 넣음. 큐가 가득 차 있으면 False."""
+        try:
+            self.outbox.put_nowait(data)
+            return True
+        except queue.Full:
+            return False
+
+    def _drain(self) -> None:
+        """송신 큐를 비우는 루프 (이 클라이언트 전용 스레드)."""
+        pending: Deque[memoryview] = deque()
+        while True:
+            data = self.outbox.get()
+            stop = data is None
+            if not stop:
+                pending.append(data)
+            # 보내는 동안 쌓인 메시지를 모아서 sendmsg 한 번으로 보냄
+            while not stop and len(pending) < MAX_IOV:
+                try:
+                    data = self.outbox.get_nowait()
+                except queue.Empty:
+                    break
+                if data is None:
+                    stop = True
+                else:
+                    pending.append(data)
+            try:
+                while pending:
+                    consume(pending, send_buffers(self.sock, pending))
+            except OSError:
+                self.abort()
+                return
+            if stop:
+                return
+
+    def abort(self) -> None:
+        """소켓을 shutdown해서 수신 스레드(recv)와 송신 스레드(sendall)를 모두 깨움."""
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def close(self, timeout: float = 2.0) -> None:
+        """남은 메시지를 timeout 동안 보내 보고 소켓을 닫음."""
+        try:
+            self.outbox.put_nowait(None)
+        except queue.Full:
+            self.abort()
+        self.writer.join(timeout)
+        self.abort()
+        try:
+            self.sock.close()
+        except OSError:
+            pass
 
 
 class ChatServer:
     """멀티스레드 TCP 채팅 서버."""
 
-    def __init__(self, host: str = '0.0.0.0', port: int = 5000) -> None:
+    def __init__(self, host: str = '0.0.0.0', port: int = 5000,
+                 max_pending: int = MAX_PENDING, overflow: str = 'disconnect') -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'overflow는 {OVERFLOW_POLICIES} 중 하나여야 합니다: {overflow}')
         self.host = host
         self.port = port
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM) # AF_INET + SOCK_STREAM → TCP 소켓.
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1) # SO_REUSEADDR로 재시작 시 포트 재사용.
-        # 접속 사용자 등록부: 사용자명 -> (소켓, 주소)
-        self.clients: Dict[str, Tuple[socket.socket, Tuple[str, int]]] = {}
+        # 접속 사용자 등록부: 사용자명 -> 세션(소켓, 주소, 송신 큐)
+        # 잠금은 등록부를 읽고 쓸 때만 잡고, 소켓 I/O 중에는 잡지 않음
+        self.clients: Dict[str, _ClientSession] = {}
         self.clients_lock = threading.Lock()
+        self.max_pending = max_pending
+        self.overflow = overflow
 
         self.running = False
 
@@ -46,13 +203,14 @@ class ChatServer:
         """서버 종료."""
         self.running = False
         with self.clients_lock:
-            for username, (sock, _) in list(self.clients.items()):
-                try:
-                    sock.shutdown(socket.SHUT_RDWR)
-                except OSError:
-                    pass
-                sock.close()
+            sessions = list(self.clients.values())
             self.clients.clear()
+        for session in sessions:
+            session.abort()
+            try:
+                session.sock.close()
+            except OSError:
+                pass
         try:
             self.server_socket.close()
         except OSError:
@@ -67,8 +225,9 @@ class ChatServer:
             self._safe_close(client_sock)
             return
         """입장 안내 브로드캐스트"""
+        session = _ClientSession(client_sock, addr, self.max_pending)
         with self.clients_lock:
-            self.clients[username] = (client_sock, addr)
+            self.clients[username] = session
 
         self._broadcast(f'-- {username} 님이 입장하셨습니다. --', exclude=None)
 
@@ -85,14 +244,14 @@ class ChatServer:
 
                 # 종료 명령
                 if msg == '/종료':
-                    self._send_line(client_sock, '서버와의 연결을 종료합니다.')
+                    self._deliver(session, '서버와의 연결을 종료합니다.')
                     break
 
                 # ======= 보너스 과제: 귓속말 기능 구현 =======
                 # 사용법 1) /귓속말 대상유저 메시지...
                 # 사용법 2) /w 대상유저 메시지...
-                if msg.startswith('/귓속말 ') or msg.startswith('/w '):
-                    self._handle_whisper(username, msg, client_sock)
+                if is_whisper(msg):
+                    self._handle_whisper(username, msg, session)
                     continue
                 # ===========================================
 
@@ -113,12 +272,9 @@ class ChatServer:
                 return ''
             candidate = data.decode('utf-8', errors='ignore').strip()
 
-            if not candidate:
-                self._send_line(client_sock, '공백은 이름으로 사용할 수 없습니다. 다시 입력해 주세요: ')
-                continue
-
-            if ' ' in candidate:
-                self._send_line(client_sock, '이름에는 공백을 포함할 수 없습니다. 다시 입력해 주세요: ')
+            error = validate_username(candidate)
+            if error:
+                self._send_line(client_sock, error)
                 continue
 
             with self.clients_lock:
@@ -130,92 +286,368 @@ class ChatServer:
             self._send_line(client_sock, f'환영합니다, {candidate}님! 채팅에 참여하였습니다.')
             return candidate
 
-    def _handle_whisper(self, sender: str, raw: str, client_sock: socket.socket) -> None:
+    def _handle_whisper(self, sender: str, raw: str, session: _ClientSession) -> None:
         """보너스 과제: 귓속말 처리."""
-        # 포맷 통일: '/귓속말 ' 또는 '/w ' 제거
-        if raw.startswith('/귓속말 '):
-            content = raw[len('/귓속말 '):].strip()
-        else:
-            content = raw[len('/w '):].strip()
-
-        if not content:
-            self._send_line(client_sock, '사용법: /귓속말 대상사용자 메시지  또는  /w 대상사용자 메시지')
-            return
-
-        # 첫 토큰은 대상 사용자, 나머지는 메시지
-        parts = content.split(' ', 1)
-        if len(parts) < 2:
-            self._send_line(client_sock, '사용법: /귓속말 대상사용자 메시지  또는  /w 대상사용자 메시지')
-            return
-
-        target_user, message = parts[0].strip(), parts[1].strip()
-        if not target_user or not message:
-            self._send_line(client_sock, '대상 사용자와 메시지를 정확히 입력해 주세요.')
+        target_user, message, error = parse_whisper(raw)
+        if error:
+            self._deliver(session, error)
             return
 
         with self.clients_lock:
-            target_entry = self.clients.get(target_user)
+            target = self.clients.get(target_user)
 
-        if not target_entry:
-            self._send_line(client_sock, f'[{target_user}] 사용자를 찾을 수 없습니다.')
+        if not target:
+            self._deliver(session, f'[{target_user}] 사용자를 찾을 수 없습니다.')
             return
 
-        target_sock, _ = target_entry
         whisper_to_target = f'(귓속말) {sender}> {message}'
         whisper_to_sender = f'(귓속말 전송됨) {sender} -> {target_user}: {message}'
 
-        self._send_line(target_sock, whisper_to_target)
-        self._send_line(client_sock, whisper_to_sender)
+        self._deliver(target, whisper_to_target)
+        self._deliver(session, whisper_to_sender)
 
     def _broadcast(self, line: str, exclude: str = None) -> None:
-        """모든 클라이언트에게 메시지 전파."""
-        to_remove = []
+        """모든 클라이언트에게 메시지 전파 (송신 큐에 넣기만 하고 바로 반환)."""
+        # 잠금은 받는 사람 목록을 복사하는 동안만 잡음
         with self.clients_lock:
-            for username, (sock, _) in self.clients.items():
-                if exclude and username == exclude:
-                    continue
-                try:
-                    sock.sendall((line + '\n').encode('utf-8'))
-                except (BrokenPipeError, OSError):
-                    to_remove.append(username)
-
-            # 전송 실패한 소켓 정리
-            for username in to_remove:
-                entry = self.clients.pop(username, None)
-                if entry:
-                    try:
-                        entry[0].close()
-                    except OSError:
-                        pass
+            targets = [session for username, session in self.clients.items()
+                       if not (exclude and username == exclude)]
+        # 인코딩은 한 번만, 모든 송신 큐가 같은 버퍼를 공유
+        data = memoryview(encode_line(line))
+        for session in targets:
+            self._enqueue(session, data)
+
+    def _deliver(self, session: _ClientSession, line: str) -> None:
+        """등록된 사용자에게 한 줄 전달."""
+        self._enqueue(session, memoryview(encode_line(line)))
+
+    def _enqueue(self, session: _ClientSession, data: memoryview) -> None:
+        """송신 큐에 넣음. 큐가 가득 차면 overflow 정책을 따름."""
+        if session.enqueue(data):
+            return
+        if self.overflow == 'disconnect':
+            # 수신 스레드가 recv에서 깨어나 _cleanup_user()로 정리함
+            session.abort()
 
     def _send_line(self, sock: socket.socket, line: str) -> None:
-        """단일 소켓에 한 줄 전송."""
+        """단일 소켓에 한 줄 전송 (등록 전 이름 확인 단계에서만 사용)."""
         try:
-            sock.sendall((line + '\n').encode('utf-8'))
+            sock.sendall(encode_line(line))
+        except OSError:
+            pass
+
+    def _safe_close(self, sock: socket.socket) -> None:
+        """이름을 받기 전에 끊긴 소켓 정리."""
+        try:
+            sock.close()
         except OSError:
             pass
 
     def _cleanup_user(self, username: str) -> None:
         """사용자 퇴장 처리 및 브로드캐스트."""
         with self.clients_lock:
-            entry = self.clients.pop(username, None)
+            session = self.clients.pop(username, None)
 
-        if entry:
-            sock, _ = entry
-            try:
-                sock.shutdown(socket.SHUT_RDWR)
-            except OSError:
-                pass
+        if session:
+            # /종료 안내처럼 큐에 남은 메시지를 보내고 닫음
+            session.close()
+            self._broadcast(f'-- {username} 님이 퇴장하셨습니다. --', exclude=None)
+
+
+class _Connection:
+    """이벤트 루프 서버에서 연결 하나의 상태."""
+
+    # 유휴 연결 수만 개를 들고 있어도 메모리가 적게 들도록 __slots__ 사용
+    __slots__ = ('sock', 'addr', 'username', 'inbuf', 'outq', 'writing', 'closing', 'closed')
+
+    def __init__(self, sock: socket.socket, addr: Tuple[str, int]) -> None:
+        self.sock = sock
+        self.addr = addr
+        self.username = ''            # 이름 확정 전에는 ''
+        self.inbuf = bytearray()      # 아직 줄바꿈이 오지 않은 수신 데이터
+        self.outq: Deque[memoryview] = deque()  # 아직 보내지 못한 메시지 (최대 max_pending개)
+        self.writing = False          # 셀렉터에 EVENT_WRITE도 등록되어 있는지
+        self.closing = False          # 남은 송신 데이터를 보낸 뒤 닫기(/종료)
+        self.closed = False
+
+
+class SelectorChatServer:
+    """selectors 기반 단일 스레드 TCP 채팅 서버.
+
+    연결마다 스레드를 만드는 대신 논블로킹 소켓을 셀렉터(리눅스는 epoll)에 등록해
+    한 스레드에서 처리한다. 유휴 연결은 셀렉터 등록과 작은 버퍼만 차지하므로
+    한 코어에서 수만 명의 접속을 유지할 수 있다. 명령과 이름 확인 절차는 ChatServer와 같다.
+    """
+
+    # 줄바꿈 없이 이 길이를 넘으면 그대로 한 메시지로 처리
+    MAX_LINE = 4096
+
+    def __init__(self, host: str = '0.0.0.0', port: int = 5000, backlog: int = 4096,
+                 max_pending: int = MAX_PENDING, overflow: str = 'disconnect') -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'overflow는 {OVERFLOW_POLICIES} 중 하나여야 합니다: {overflow}')
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server_socket.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        # 접속 사용자 등록부: 사용자명 -> 연결 (이벤트 루프 스레드에서만 접근하므로 잠금 불필요)
+        self.clients: Dict[str, _Connection] = {}
+        self.max_pending = max_pending
+        self.overflow = overflow
+        # 송신 실패나 송신 큐 초과로 닫아야 할 연결 (순회 도중 등록부가 바뀌지 않도록 루프 끝에서 정리)
+        self._dead: List[_Connection] = []
+        # 이번 루프에서 새 메시지가 쌓인 연결 (루프 끝에서 연결마다 sendmsg 한 번으로 몰아 보냄)
+        self._dirty: Set[_Connection] = set()
+
+        self.running = False
+
+    def start(self) -> None:
+        """서버 시작."""
+        raise_fd_limit()
+        self.server_socket.bind((self.host, self.port))
+        self.server_socket.listen(self.backlog)
+        self.selector.register(self.server_socket, selectors.EVENT_READ, None)
+
+        self.running = True
+        print(f'[INFO] 채팅서버 시작(이벤트 루프)! {self.host}:{self.port}')
+
+        try:
+            while self.running:
+                for key, mask in self.selector.select(timeout=1.0):
+                    conn = key.data
+                    if conn is None:
+                        self._accept()
+                        continue
+                    if mask & selectors.EVENT_READ and not conn.closed:
+                        self._on_readable(conn)
+                    if mask & selectors.EVENT_WRITE and not conn.closed:
+                        self._flush(conn)
+                self._flush_dirty()
+        except KeyboardInterrupt:
+            print('\n[INFO] KeyboardInterrupt: shutting down...')
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        """서버 종료."""
+        self.running = False
+        for key in list(self.selector.get_map().values()):
+            if key.data is not None:
+                self._close_socket(key.data)
+        self.clients.clear()
+        try:
+            self.selector.close()
+            self.server_socket.close()
+        except OSError:
+            pass
+        print('[INFO] Server closed.')
+
+    def _accept(self) -> None:
+        """대기 중인 접속을 한 번에 모두 수락."""
+        while True:
             try:
-                sock.close()
+                client_sock, addr = self.server_socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
             except OSError:
-                pass
+                # 파일 디스크립터 부족(EMFILE) 등: 이번 차례는 넘기고 다음 이벤트에서 다시 시도
+                return
+            client_sock.setblocking(False)
+            conn = _Connection(client_sock, addr)
+            self.selector.register(client_sock, selectors.EVENT_READ, conn)
+            self._send_line(conn, '안녕하세요! 사용자 이름을 입력해 주세요: ')
+
+    def _on_readable(self, conn: _Connection) -> None:
+        """수신 데이터를 줄 단위로 나눠 처리."""
+        try:
+            data = conn.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b''
+        if not data:
+            # 소켓이 끊어진 경우
+            self._close(conn)
+            return
 
-            self._broadcast(f'-- {username} 님이 퇴장하셨습니다. --', exclude=None)
+        conn.inbuf += data
+        while not conn.closed and not conn.closing:
+            end = conn.inbuf.find(b'\n')
+            if end < 0:
+                if len(conn.inbuf) < self.MAX_LINE:
+                    break
+                end = len(conn.inbuf)
+            line = bytes(conn.inbuf[:end])
+            del conn.inbuf[:end + 1]
+            self._handle_line(conn, line.decode('utf-8', errors='ignore').strip())
+
+    def _handle_line(self, conn: _Connection, msg: str) -> None:
+        """한 줄 처리: 이름 확정 전이면 이름으로, 이후에는 명령/메시지로."""
+        if not conn.username:
+            self._register_username(conn, msg)
+            return
+
+        if not msg:
+            return
+
+        # 종료 명령
+        if msg == '/종료':
+            self._send_line(conn, '서버와의 연결을 종료합니다.')
+            conn.closing = True
+            if not conn.outq:
+                self._close(conn)
+            return
+
+        # 귓속말: /귓속말 대상유저 메시지... 또는 /w 대상유저 메시지...
+        if is_whisper(msg):
+            self._handle_whisper(conn, msg)
+            return
+
+        # 일반 메시지 브로드캐스트
+        self._broadcast(f'{conn.username}> {msg}')
+
+    def _register_username(self, conn: _Connection, candidate: str) -> None:
+        """중복되지 않는 올바른 사용자명이면 등록하고 입장 안내."""
+        error = validate_username(candidate)
+        if error:
+            self._send_line(conn, error)
+            return
+        if candidate in self.clients:
+            self._send_line(conn, '이미 사용 중인 이름입니다. 다른 이름을 입력해 주세요: ')
+            return
+
+        conn.username = candidate
+        self.clients[candidate] = conn
+        self._send_line(conn, f'환영합니다, {candidate}님! 채팅에 참여하였습니다.')
+        self._broadcast(f'-- {candidate} 님이 입장하셨습니다. --')
+
+    def _handle_whisper(self, conn: _Connection, raw: str) -> None:
+        """귓속말 처리."""
+        target_user, message, error = parse_whisper(raw)
+        if error:
+            self._send_line(conn, error)
+            return
+
+        target = self.clients.get(target_user)
+        if not target:
+            self._send_line(conn, f'[{target_user}] 사용자를 찾을 수 없습니다.')
+            return
+
+        self._send_line(target, f'(귓속말) {conn.username}> {message}')
+        self._send_line(conn, f'(귓속말 전송됨) {conn.username} -> {target_user}: {message}')
+
+    def _broadcast(self, line: str, exclude: str = None) -> None:
+        """모든 클라이언트에게 메시지 전파."""
+        # 인코딩은 한 번만, 모든 송신 큐가 같은 버퍼를 공유
+        data = memoryview(encode_line(line))
+        for username, conn in self.clients.items():
+            if exclude and username == exclude:
+                continue
+            self._enqueue(conn, data)
+
+    def _send_line(self, conn: _Connection, line: str) -> None:
+        """한 연결에 한 줄 전송."""
+        self._enqueue(conn, memoryview(encode_line(line)))
+
+    def _enqueue(self, conn: _Connection, data: memoryview) -> None:
+        """송신 큐에 넣고 루프 끝에서 보내도록 표시. 큐가 가득 차면 overflow 정책을 따름."""
+        if conn.closed:
+            return
+        if len(conn.outq) >= self.max_pending:
+            if self.overflow == 'disconnect':
+                self._dead.append(conn)
+            return
+        conn.outq.append(data)
+        if not conn.writing:
+            # EVENT_WRITE를 기다리는 연결은 셀렉터가 알려줄 때 보냄
+            self._dirty.add(conn)
+
+    def _flush_dirty(self) -> None:
+        """이번 루프에서 쌓인 메시지를 연결마다 한 번에 보내고, 닫을 연결 정리."""
+        while self._dirty or self._dead:
+            dirty, self._dirty = self._dirty, set()
+            for conn in dirty:
+                if not conn.closed:
+                    self._flush(conn)
+            self._reap()
+
+    def _flush(self, conn: _Connection) -> None:
+        """송신 큐를 커널이 받아주는 만큼 sendmsg로 모아 보냄. 남으면 EVENT_WRITE를 기다림."""
+        try:
+            while conn.outq:
+                consume(conn.outq, send_buffers(conn.sock, conn.outq))
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self._dead.append(conn)
+            return
+
+        if not conn.outq and conn.closing:
+            self._dead.append(conn)
+            return
+        want_write = bool(conn.outq)
+        if want_write != conn.writing:
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if want_write else 0)
+            self.selector.modify(conn.sock, events, conn)
+            conn.writing = want_write
+
+    def _reap(self) -> None:
+        """송신 실패 또는 /종료로 닫을 연결 정리 (정리 중 퇴장 안내가 또 실패를 만들 수 있어 반복)."""
+        while self._dead:
+            self._close(self._dead.pop())
+
+    def _close(self, conn: _Connection) -> None:
+        """사용자 퇴장 처리 및 브로드캐스트."""
+        if conn.closed:
+            return
+        self._close_socket(conn)
+        if conn.username and self.clients.get(conn.username) is conn:
+            del self.clients[conn.username]
+            self._broadcast(f'-- {conn.username} 님이 퇴장하셨습니다. --')
+
+    def _close_socket(self, conn: _Connection) -> None:
+        """셀렉터 등록 해제 후 소켓 닫기."""
+        conn.closed = True
+        try:
+            self.selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            conn.sock.close()
+        except OSError:
+            pass
+
+
+def raise_fd_limit() -> None:
+    """열 수 있는 파일(소켓) 수 제한을 허용된 최대치까지 올림 (유닉스 전용)."""
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        except (ValueError, OSError):
+            pass
 
 
 def main() -> None:
-    server = ChatServer(host='0.0.0.0', port=5000)
+    parser = argparse.ArgumentParser(description='TCP 채팅 서버')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--threaded', action='store_true',
+                        help='연결마다 스레드를 쓰는 기존 방식으로 실행')
+    parser.add_argument('--max-pending', type=int, default=MAX_PENDING,
+                        help='클라이언트별 송신 큐 최대 메시지 수')
+    parser.add_argument('--overflow', choices=OVERFLOW_POLICIES, default='disconnect',
+                        help='송신 큐가 가득 찼을 때: 새 메시지 버리기(drop) 또는 연결 끊기(disconnect)')
+    args = parser.parse_args()
+
+    server_class = ChatServer if args.threaded else SelectorChatServer
+    server = server_class(host=args.host, port=args.port,
+                          max_pending=args.max_pending, overflow=args.overflow)
     server.start()
 
 